@@ -0,0 +1,132 @@
+"""
+Compara as estratégias de leitura de last_lines: blocos fixos de io.DEFAULT_BUFFER_SIZE
+(comportamento anterior), blocos adaptativos, os.pread e posix_fadvise.
+
+Para cada estratégia são medidos o tempo até a primeira linha, a vazão da leitura
+completa do arquivo e o número de chamadas de sistema de leitura (seek, read, pread
+e posix_fadvise), contadas em uma execução separada da medição de tempo.
+
+Uso, a partir do diretório `desafio`:
+    python -m benchmarks.last_lines_reads [tamanho do arquivo em MiB]
+"""
+import io
+import os
+import random
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from unittest import mock
+
+from functions import last_lines as last_lines_module
+from functions.last_lines import last_lines
+
+STRATEGIES = {
+    'fixo (8 KiB)': {'max_buffer_size': None},
+    'adaptativo': {},
+    'adaptativo + pread': {'pread': True},
+    'adaptativo + pread + fadvise': {'pread': True, 'readahead': True},
+}
+
+
+def write_log(path, size, seed=0):
+    """
+    Grava um arquivo de log sintético com aproximadamente size bytes.
+    """
+    rng = random.Random(seed)
+    levels = ['INFO'] * 8 + ['WARNING', 'ERROR']
+    lines = [
+        f'2020-12-01T00:00:{i % 60:02d} {rng.choice(levels)} requisição {i} ' + 'x' * rng.randint(10, 150) + '\n'
+        for i in range(10_000)
+    ]
+    chunk = ''.join(lines).encode('utf-8')
+    with open(path, 'wb') as f:
+        for _ in range(max(1, size // len(chunk))):
+            f.write(chunk)
+
+
+class _CountingFile:
+    """
+    Envolve um arquivo aberto contando as chamadas de seek e read.
+    """
+
+    def __init__(self, f, counter):
+        self.f = f
+        self.counter = counter
+
+    def seek(self, *args):
+        self.counter['seek'] += 1
+        return self.f.seek(*args)
+
+    def read(self, *args):
+        self.counter['read'] += 1
+        return self.f.read(*args)
+
+    def __getattr__(self, name):
+        return getattr(self.f, name)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.f.close()
+
+
+@contextmanager
+def count_syscalls():
+    """
+    Conta as chamadas de seek, read, pread e posix_fadvise feitas por last_lines.
+    """
+    counter = {'seek': 0, 'read': 0, 'pread': 0, 'fadvise': 0}
+    real_open, real_pread = open, os.pread
+    real_fadvise = getattr(os, 'posix_fadvise', None)
+
+    def counting_pread(*args):
+        counter['pread'] += 1
+        return real_pread(*args)
+
+    def counting_fadvise(*args):
+        counter['fadvise'] += 1
+        return real_fadvise(*args)
+
+    with mock.patch.object(last_lines_module, 'open', lambda *args: _CountingFile(real_open(*args), counter),
+                           create=True), \
+            mock.patch.object(os, 'pread', counting_pread), \
+            mock.patch.object(os, 'posix_fadvise', counting_fadvise, create=True):
+        yield counter
+
+
+def measure(path, options):
+    start = time.perf_counter()
+    lines = last_lines(path, **options)
+    next(lines)
+    first_line = time.perf_counter() - start
+    for _ in lines:
+        pass
+    total = time.perf_counter() - start
+    return first_line, total
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    size = int(argv[0]) << 20 if argv else 256 << 20
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = os.path.join(tmpdir, 'app.log')
+        write_log(path, size)
+        size = os.path.getsize(path)
+        print(f'arquivo: {size / (1 << 20):.0f} MiB, bloco inicial: {io.DEFAULT_BUFFER_SIZE} bytes, '
+              f'bloco máximo: {last_lines_module.MAX_BUFFER_SIZE} bytes')
+
+        for name, options in STRATEGIES.items():
+            with count_syscalls() as counter:
+                for _ in last_lines(path, **options):
+                    pass
+            syscalls = sum(counter.values())
+            first_line, total = min(measure(path, options) for _ in range(3))
+            print(f'{name:30} {syscalls:9d} chamadas  primeira linha {first_line * 1e6:7.0f} µs  '
+                  f'{size / total / (1 << 20):7.1f} MiB/s')
+
+
+if __name__ == '__main__':
+    main()
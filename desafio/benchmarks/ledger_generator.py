@@ -0,0 +1,64 @@
+"""
+Gerador de livros-razão sintéticos para os benchmarks de reconciliação.
+"""
+import random
+from datetime import date
+
+
+def generate_ledgers(size, duplicate_rate=0.05, key_cardinality=1000, skew=0.0, date_jitter=1,
+                     match_rate=0.9, days=30, seed=0):
+    """
+    Gera duas listas de transações no formato [data, departamento, valor, beneficiário].
+
+    Parâmetros:
+    - size (int): número de transações de cada lista
+    - duplicate_rate (float): probabilidade de uma transação repetir exatamente uma anterior da mesma lista
+    - key_cardinality (int): número de chaves (departamento, valor, beneficiário) distintas
+    - skew (float): fração das transações concentrada em poucas chaves "quentes" (1% das chaves)
+    - date_jitter (int): diferença máxima, em dias, entre uma transação e sua correspondente na lista 2
+    - match_rate (float): fração das transações da lista 1 que possuem correspondente na lista 2
+    - days (int): quantidade de dias cobertos pelas transações
+    - seed (int): semente do gerador aleatório; a mesma semente sempre gera as mesmas listas
+
+    Retorno:
+    - Duas listas de transações
+    """
+    rng = random.Random(seed)
+    first_day = date(2020, 12, 1).toordinal()
+    departments = [f'Departamento {i}' for i in range(20)]
+    keys = [
+        (rng.choice(departments), f'{rng.randint(100, 1_000_000) / 100:.2f}', f'Beneficiário {i}')
+        for i in range(key_cardinality)
+    ]
+    hot_keys = keys[:max(1, key_cardinality // 100)]
+
+    def random_key():
+        return rng.choice(hot_keys) if rng.random() < skew else rng.choice(keys)
+
+    def random_date(ordinal=None):
+        if ordinal is None:
+            ordinal = first_day + rng.randrange(days)
+        else:
+            ordinal += rng.randint(-date_jitter, date_jitter)
+        return date.fromordinal(ordinal).isoformat()
+
+    def random_transaction():
+        return [random_date(), *random_key()]
+
+    def with_duplicates(transactions):
+        for i in range(1, len(transactions)):
+            if rng.random() < duplicate_rate:
+                transactions[i] = transactions[rng.randrange(i)][:]
+        return transactions
+
+    transactions1 = with_duplicates([random_transaction() for _ in range(size)])
+
+    transactions2 = []
+    for transaction in transactions1:
+        if rng.random() < match_rate:
+            ordinal = date.fromisoformat(transaction[0]).toordinal()
+            transactions2.append([random_date(ordinal), *transaction[1:4]])
+    transactions2.extend(random_transaction() for _ in range(size - len(transactions2)))
+    rng.shuffle(transactions2)
+
+    return transactions1, transactions2
@@ -0,0 +1,70 @@
+"""
+Compara reconcile_accounts com parallel_reconcile_accounts em vários números de processos.
+
+Para cada configuração é medido o melhor tempo de algumas execuções, e também o tempo
+da etapa serial de parallel_reconcile_accounts (codificação das chaves e divisão em
+shards), que limita o ganho possível com mais processos. O ganho só aparece em
+máquinas com mais de um núcleo.
+
+Uso, a partir do diretório `desafio`:
+    python -m benchmarks.parallel_reconcile [transações por lista] [tolerância de datas]
+"""
+import os
+import sys
+import time
+
+from functions.parallel_reconcile_accounts import _shard_transactions, parallel_reconcile_accounts
+from functions.reconcile_accounts import reconcile_accounts
+from functions.transaction_keys import TransactionKeyEncoder
+
+from .ledger_generator import generate_ledgers
+
+
+def _clone(transactions):
+    return [t[:] for t in transactions]
+
+
+def best_time(function, transactions1, transactions2, repeat=3):
+    """
+    Melhor tempo entre repeat execuções, cada uma sobre cópias novas das listas
+    (as funções de reconciliação acrescentam as flags nas listas recebidas).
+    """
+    times = []
+    for _ in range(repeat):
+        copy1, copy2 = _clone(transactions1), _clone(transactions2)
+        start = time.perf_counter()
+        function(copy1, copy2)
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def sharding_time(transactions1, transactions2, shards):
+    start = time.perf_counter()
+    encode_key = TransactionKeyEncoder()
+    _shard_transactions(transactions1, encode_key.encode_all(transactions1), shards)
+    _shard_transactions(transactions2, encode_key.encode_all(transactions2), shards)
+    return time.perf_counter() - start
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    size = int(argv[0]) if argv else 500_000
+    date_tolerance = int(argv[1]) if len(argv) > 1 else None
+    cpus = os.cpu_count() or 1
+    transactions1, transactions2 = generate_ledgers(size, seed=0)
+
+    single = best_time(lambda t1, t2: reconcile_accounts(t1, t2, date_tolerance), transactions1, transactions2)
+    print(f'{size} transações por lista, {cpus} núcleos, date_tolerance={date_tolerance}')
+    print(f'{"reconcile_accounts":34} {single:7.3f}s')
+
+    for workers in sorted({2, 4, cpus} - {1}):
+        elapsed = best_time(lambda t1, t2: parallel_reconcile_accounts(t1, t2, workers=workers,
+                                                                       date_tolerance=date_tolerance),
+                            transactions1, transactions2)
+        serial = sharding_time(transactions1, transactions2, workers * 4)
+        print(f'{f"parallel_reconcile_accounts({workers})":34} {elapsed:7.3f}s  '
+              f'({single / elapsed:.2f}x, etapa serial {serial:.3f}s)')
+
+
+if __name__ == '__main__':
+    main()
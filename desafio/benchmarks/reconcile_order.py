@@ -0,0 +1,68 @@
+"""
+Compara a reconciliação anterior (ordenação das transações + restore_original_order)
+com a versão atual de reconcile_accounts, que ordena apenas permutações de índices.
+
+Uso, a partir do diretório `desafio`:
+    python -m benchmarks.reconcile_order [quantidade de transações]
+"""
+import sys
+import time
+
+from functions.reconcile_accounts import group_transactions_by_key, reconcile_accounts, restore_original_order
+
+from .ledger_generator import generate_ledgers
+
+
+def legacy_reconcile_accounts(transactions1, transactions2):
+    """
+    Implementação anterior de reconcile_accounts, mantida aqui apenas para comparação.
+    """
+    dict1 = group_transactions_by_key(transactions1)
+    dict2 = group_transactions_by_key(transactions2)
+    transactions1_sorted = sorted(transactions1, key=lambda x: x[0])
+    transactions2_sorted = sorted(transactions2, key=lambda x: x[0])
+
+    def flag_transactions(transactions, compare_dict):
+        for transaction in transactions:
+            key = tuple(transaction[1:4])
+            if key in compare_dict and compare_dict[key]:
+                transaction.append('FOUND')
+                compare_dict[key].popleft()
+                if not compare_dict[key]:
+                    del compare_dict[key]
+            else:
+                transaction.append('MISSING')
+
+    flag_transactions(transactions1_sorted, dict2)
+    flag_transactions(transactions2_sorted, dict1)
+    return (restore_original_order(transactions1, transactions1_sorted),
+            restore_original_order(transactions2, transactions2_sorted))
+
+
+def best_time(function, transactions1, transactions2, repeat=3):
+    """
+    Menor tempo entre `repeat` execuções, cada uma sobre uma cópia nova das listas.
+    """
+    times = []
+    for _ in range(repeat):
+        copy1 = [t[:] for t in transactions1]
+        copy2 = [t[:] for t in transactions2]
+        start = time.perf_counter()
+        function(copy1, copy2)
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main(size=200_000):
+    transactions1, transactions2 = generate_ledgers(size)
+
+    legacy = best_time(legacy_reconcile_accounts, transactions1, transactions2)
+    current = best_time(reconcile_accounts, transactions1, transactions2)
+
+    print(f'{size} transações por lista')
+    print(f'ordenação + restore_original_order: {legacy:.3f}s')
+    print(f'permutação de índices:              {current:.3f}s ({legacy / current:.2f}x)')
+
+
+if __name__ == '__main__':
+    main(*(int(arg) for arg in sys.argv[1:]))
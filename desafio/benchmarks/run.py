@@ -0,0 +1,140 @@
+"""
+Cenários de benchmark de reconcile_accounts e de suas funções auxiliares.
+
+Os resultados são gravados em JSON, para comparar execuções entre commits.
+
+Uso, a partir do diretório `desafio`:
+    python -m benchmarks.run -o antes.json
+    python -m benchmarks.run -o depois.json --compare antes.json
+"""
+import argparse
+import gc
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+
+from functions.reconcile_accounts import group_transactions_by_key, reconcile_accounts, restore_original_order
+
+from .ledger_generator import generate_ledgers
+
+
+def _clone(transactions):
+    return [t[:] for t in transactions]
+
+
+def _sorted_with_flags(transactions):
+    """
+    Entrada de restore_original_order: as transações ordenadas por data e com flag.
+    """
+    return [[*t, 'FOUND'] for t in sorted(transactions, key=lambda t: t[0])]
+
+
+# Cada cenário recebe as duas listas e devolve uma função sem argumentos a ser medida.
+# A preparação (cópias, ordenações) fica fora da medição.
+SCENARIOS = {
+    'reconcile_accounts': lambda t1, t2: (
+        lambda c1=_clone(t1), c2=_clone(t2): reconcile_accounts(c1, c2)),
+    'reconcile_accounts[date_tolerance=1]': lambda t1, t2: (
+        lambda c1=_clone(t1), c2=_clone(t2): reconcile_accounts(c1, c2, date_tolerance=1)),
+    'group_transactions_by_key': lambda t1, t2: (
+        lambda: group_transactions_by_key(t1)),
+    'restore_original_order': lambda t1, t2: (
+        lambda flagged=_sorted_with_flags(t1): restore_original_order(t1, flagged)),
+}
+
+PROFILES = {
+    'uniforme': {},
+    'chaves_quentes': {'skew': 0.8},
+    'muitas_duplicatas': {'duplicate_rate': 0.5},
+    'poucas_chaves': {'key_cardinality': 10},
+}
+
+
+def measure(function):
+    """
+    Tempo de uma execução, com o coletor de lixo desligado (como no timeit).
+    """
+    gc.collect()
+    gc.disable()
+    try:
+        start = time.perf_counter()
+        function()
+        return time.perf_counter() - start
+    finally:
+        gc.enable()
+
+
+def run(size, repeat, seed):
+    results = []
+    for profile, params in PROFILES.items():
+        transactions1, transactions2 = generate_ledgers(size, seed=seed, **params)
+        for name, prepare in SCENARIOS.items():
+            # Cada repetição precisa de uma preparação nova, já que reconcile_accounts altera as listas
+            times = [measure(prepare(transactions1, transactions2)) for _ in range(repeat)]
+            results.append({
+                'scenario': name,
+                'profile': profile,
+                'params': params,
+                'size': size,
+                'best': min(times),
+                'mean': statistics.mean(times),
+                'rows_per_second': size / min(times) if min(times) > 0 else None,
+            })
+    return results
+
+
+def _git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results, baseline):
+    """
+    Imprime a razão entre o melhor tempo de cada cenário e o de uma execução anterior.
+    """
+    previous = {(r['scenario'], r['profile'], r['size']): r['best'] for r in baseline['results']}
+    for result in results:
+        before = previous.get((result['scenario'], result['profile'], result['size']))
+        if before:
+            print(f"{result['scenario']:40} {result['profile']:20} {before:.4f}s -> {result['best']:.4f}s "
+                  f"({before / result['best']:.2f}x)")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m benchmarks.run', description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--size', type=int, default=100_000, help='transações por lista')
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('-o', '--output', help='arquivo JSON de saída (padrão: saída padrão)')
+    parser.add_argument('--compare', help='JSON de uma execução anterior para comparação')
+    args = parser.parse_args(argv)
+
+    report = {
+        'commit': _git_commit(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'size': args.size,
+        'repeat': args.repeat,
+        'seed': args.seed,
+        'results': run(args.size, args.repeat, args.seed),
+    }
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+    else:
+        json.dump(report, sys.stdout, indent=2, ensure_ascii=False)
+        print()
+
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            compare(report['results'], json.load(f))
+
+
+if __name__ == '__main__':
+    main()
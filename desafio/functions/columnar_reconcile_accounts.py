@@ -0,0 +1,159 @@
+from .transaction_keys import canonical_value
+
+try:
+    import numpy as np
+except ImportError:  # numpy é opcional, necessário apenas para este módulo
+    np = None
+
+
+def _require_numpy():
+    if np is None:
+        raise ImportError("columnar_reconcile_accounts requer o pacote numpy (pip install numpy).")
+
+
+class TransactionColumns:
+    """
+    Representação colunar de uma lista de transações.
+
+    Atributos:
+    - keys: array int64 com o código da chave (departamento, valor, beneficiário) de cada transação
+    - dates: array int64 com a data de cada transação, em dias desde 1970-01-01
+    """
+
+    def __init__(self, keys, dates):
+        self.keys = keys
+        self.dates = dates
+
+    def __len__(self):
+        return len(self.keys)
+
+
+def _dictionary_encode(transactions, field, normalize=None):
+    """
+    Substitui cada valor distinto de um campo por um inteiro, na ordem da primeira ocorrência.
+
+    Se normalize for informado, valores com a mesma forma normalizada recebem o mesmo
+    inteiro; normalize é chamada uma única vez para cada valor distinto.
+    """
+    codes = {}
+    if normalize is not None:
+        normalized = {}
+        for value in dict.fromkeys(t[field] for t in transactions):
+            codes[value] = normalized.setdefault(normalize(value), len(normalized))
+    encoded = np.fromiter(
+        (codes.setdefault(t[field], len(codes)) for t in transactions),
+        dtype=np.int64, count=len(transactions),
+    )
+    return encoded, len(set(codes.values()))
+
+
+def _combine_codes(codes1, codes2, count2):
+    """
+    Combina dois arrays de códigos em um único código por posição, compactado para 0..k-1.
+
+    A compactação mantém cada código menor que o número de transações, então o produto
+    da próxima combinação não ultrapassa o limite do int64.
+    """
+    combined_values, combined = np.unique(codes1 * count2 + codes2, return_inverse=True)
+    return combined.reshape(-1).astype(np.int64), len(combined_values)
+
+
+def encode_transactions(transactions1, transactions2):
+    """
+    Converte as duas listas de transações para o formato colunar.
+
+    Departamento, valor e beneficiário são codificados como inteiros por dicionário e a
+    data é convertida para número de dias. As duas listas são codificadas juntas para
+    que a mesma chave receba o mesmo código dos dois lados.
+
+    Observação: os valores são comparados pela forma canônica (canonical_value), como em
+    reconcile_accounts: '16.0' e '16.00' são a mesma chave, e valores que não estão em
+    centavos exatos (ex: '16.005') são comparados como texto.
+
+    Retorno:
+    - Uma tupla (TransactionColumns, TransactionColumns), uma para cada lista
+    """
+    _require_numpy()
+    size1 = len(transactions1)
+    transactions = transactions1 + transactions2
+
+    if not transactions:
+        empty = np.empty(0, dtype=np.int64)
+        return TransactionColumns(empty, empty), TransactionColumns(empty, empty)
+
+    dates = np.array([t[0] for t in transactions], dtype='datetime64[D]').astype(np.int64)
+    departments, _ = _dictionary_encode(transactions, 1)
+    beneficiaries, beneficiary_count = _dictionary_encode(transactions, 3)
+    values, value_count = _dictionary_encode(transactions, 2, canonical_value)
+
+    # Os três códigos são combinados dois a dois em um único código por chave
+    keys, _ = _combine_codes(departments, beneficiaries, beneficiary_count)
+    keys, _ = _combine_codes(keys, values, value_count)
+
+    return (
+        TransactionColumns(keys[:size1], dates[:size1]),
+        TransactionColumns(keys[size1:], dates[size1:]),
+    )
+
+
+def _rank_within_key(columns):
+    """
+    Calcula a posição de cada transação entre as transações da mesma chave,
+    ordenadas por data (empates mantêm a ordem original).
+    """
+    size = len(columns)
+    order = np.lexsort((columns.dates, columns.keys))  # lexsort é estável e ordena pela última coluna primeiro
+    sorted_keys = columns.keys[order]
+    positions = np.arange(size)
+
+    # Início do grupo de cada posição: a última posição em que a chave mudou
+    group_starts = np.ones(size, dtype=bool)
+    group_starts[1:] = sorted_keys[1:] != sorted_keys[:-1]
+    first_position = np.maximum.accumulate(np.where(group_starts, positions, 0))
+
+    ranks = np.empty(size, dtype=np.int64)
+    ranks[order] = positions - first_position
+    return ranks
+
+
+def columnar_flags(columns1, columns2):
+    """
+    Reconcilia duas listas no formato colunar.
+
+    Para cada chave, as min(n1, n2) transações mais antigas de cada lado são encontradas,
+    exatamente como em reconcile_accounts sem date_tolerance. O cálculo é feito com uma
+    ordenação e uma contagem por chave, sem nenhum laço em Python.
+
+    Retorno:
+    - Dois arrays booleanos, alinhados com columns1 e columns2, indicando se cada
+      transação foi encontrada na outra lista
+    """
+    _require_numpy()
+    key_count = int(max(columns1.keys.max(initial=-1), columns2.keys.max(initial=-1))) + 1
+    counts1 = np.bincount(columns1.keys, minlength=key_count)
+    counts2 = np.bincount(columns2.keys, minlength=key_count)
+
+    found1 = _rank_within_key(columns1) < counts2[columns1.keys]
+    found2 = _rank_within_key(columns2) < counts1[columns2.keys]
+    return found1, found2
+
+
+def columnar_reconcile_accounts(transactions1, transactions2):
+    """
+    Adaptador do motor colunar para o formato de reconcile_accounts.
+
+    Parâmetros:
+    - transactions1 (list): lista de transações 1
+    - transactions2 (list): lista de transações 2
+
+    Retorno:
+    - Duas lists: transactions1 e transactions2, com flags de 'FOUND' ou 'MISSING', na ordem original
+    """
+    columns1, columns2 = encode_transactions(transactions1, transactions2)
+    found1, found2 = columnar_flags(columns1, columns2)
+
+    for transactions, found in ((transactions1, found1), (transactions2, found2)):
+        for transaction, is_found in zip(transactions, found.tolist()):
+            transaction.append('FOUND' if is_found else 'MISSING')
+
+    return transactions1, transactions2
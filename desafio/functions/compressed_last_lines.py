@@ -0,0 +1,404 @@
+import abc
+import os
+import zlib
+from bisect import bisect_right
+
+from .last_lines import _line_blocks
+
+try:
+    import zstandard
+except ImportError:  # zstandard é opcional, necessário apenas para arquivos .zst
+    zstandard = None
+
+GZIP_MAGIC = b'\x1f\x8b'
+ZSTD_MAGIC = b'\x28\xb5\x2f\xfd'
+ZSTD_SKIPPABLE_MAGIC = 0x184D2A50
+ZSTD_SEEK_TABLE_MAGIC = 0x184D2A5E  # Frame ignorável com a tabela de busca do formato seekable
+ZSTD_SEEKABLE_MAGIC = 0x8F92EAB1    # Últimos 4 bytes de um arquivo com tabela de busca
+ZSTD_FRAME_HEADER_MAX = 18
+GZIP_WBITS = 16 + zlib.MAX_WBITS
+READ_SIZE = 1 << 16
+
+
+class _SeekableDecompressedFile(abc.ABC):
+    """
+    Objeto de arquivo somente leitura, com seek, sobre o conteúdo descomprimido de um arquivo.
+
+    O conteúdo é dividido em segmentos, cada um começando em um ponto de retomada
+    (checkpoint) a partir do qual é possível descomprimir sem ler o que vem antes.
+    Ler uma posição qualquer custa descomprimir apenas o segmento que a contém; os
+    últimos segmentos lidos ficam em cache, já que a leitura reversa de linhas
+    pede blocos vizinhos em sequência.
+
+    As subclasses montam self.checkpoints (lista de tuplas cujo primeiro item é a
+    posição descomprimida do início do segmento) e self.size, e implementam _decompress_segment.
+    """
+
+    CACHED_SEGMENTS = 2
+
+    def __init__(self, filename):
+        self.raw = open(filename, 'rb')
+        self.position = 0
+        self._cache = {}
+        try:
+            self._build_index()
+        except BaseException:
+            self.raw.close()
+            raise
+        self._segment_starts = [checkpoint[0] for checkpoint in self.checkpoints]
+
+    @abc.abstractmethod
+    def _build_index(self):
+        """Monta self.checkpoints e self.size."""
+
+    @abc.abstractmethod
+    def _decompress_segment(self, checkpoint, length):
+        """Retorna os length bytes descomprimidos a partir do checkpoint."""
+
+    def _segment(self, k):
+        if k not in self._cache:
+            if len(self._cache) >= self.CACHED_SEGMENTS:
+                self._cache.pop(next(iter(self._cache)))  # Remove o segmento mais antigo
+            start = self.checkpoints[k][0]
+            end = self.checkpoints[k + 1][0] if k + 1 < len(self.checkpoints) else self.size
+            self._cache[k] = self._decompress_segment(self.checkpoints[k], end - start)
+        return self._cache[k]
+
+    def seek(self, offset, whence=os.SEEK_SET):
+        if whence == os.SEEK_SET:
+            self.position = offset
+        elif whence == os.SEEK_CUR:
+            self.position += offset
+        elif whence == os.SEEK_END:
+            self.position = self.size + offset
+        return self.position
+
+    def tell(self):
+        return self.position
+
+    def read(self, size=-1):
+        end = self.size if size is None or size < 0 else min(self.size, self.position + size)
+        pieces = []
+        while self.position < end:
+            k = bisect_right(self._segment_starts, self.position) - 1
+            segment_start = self._segment_starts[k]
+            segment = self._segment(k)
+            piece = segment[self.position - segment_start:end - segment_start]
+            if not piece:
+                break  # Arquivo truncado: o segmento terminou antes do esperado
+            pieces.append(piece)
+            self.position += len(piece)
+        return b''.join(pieces)
+
+    def close(self):
+        self.raw.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class SeekableGzipFile(_SeekableDecompressedFile):
+    """
+    Acesso aleatório ao conteúdo de um arquivo gzip.
+
+    Na abertura, o arquivo é descomprimido uma vez, sem guardar o conteúdo, registrando
+    um checkpoint a cada checkpoint_interval bytes descomprimidos: a posição no arquivo
+    comprimido e uma cópia do estado do descompressor (zlib.decompressobj().copy()).
+    Cada membro de um gzip com vários membros (ex: arquivos concatenados ou gravados em
+    partes) também é um checkpoint, e não precisa de cópia de estado.
+
+    Parâmetros:
+    -----------
+    filename : str
+        Caminho para o arquivo gzip.
+    checkpoint_interval : int
+        Quantidade de bytes descomprimidos entre checkpoints. Cada checkpoint guarda
+        cerca de 40 KiB de estado do descompressor.
+    """
+
+    def __init__(self, filename, checkpoint_interval=4 << 20):
+        self.checkpoint_interval = checkpoint_interval
+        super().__init__(filename)
+
+    def _build_index(self):
+        raw = self.raw
+        self.checkpoints = [(0, 0, None)]  # (posição descomprimida, posição comprimida, estado)
+        decompressor = zlib.decompressobj(GZIP_WBITS)
+        read = 0              # Bytes lidos do arquivo comprimido
+        total = 0             # Bytes descomprimidos
+        since_checkpoint = 0
+        data = b''
+
+        while True:
+            if not data:
+                data = raw.read(READ_SIZE)
+                if not data:
+                    break
+                read += len(data)
+
+            produced = len(decompressor.decompress(data, READ_SIZE))
+            total += produced
+            since_checkpoint += produced
+            data = decompressor.unconsumed_tail
+
+            if decompressor.eof:
+                data = decompressor.unused_data
+                member_start = read - len(data)
+                raw.seek(member_start)
+                if raw.read(len(GZIP_MAGIC)) != GZIP_MAGIC:
+                    break  # Fim dos membros (o restante, se houver, é preenchimento)
+                raw.seek(read)
+                self.checkpoints.append((total, member_start, None))
+                decompressor = zlib.decompressobj(GZIP_WBITS)
+                since_checkpoint = 0
+            elif since_checkpoint >= self.checkpoint_interval:
+                # O estado copiado inclui unconsumed_tail, então a retomada lê a partir de `read`
+                self.checkpoints.append((total, read, decompressor.copy()))
+                since_checkpoint = 0
+
+        self.size = total
+
+    def _decompress_segment(self, checkpoint, length):
+        _, compressed_position, state = checkpoint
+        self.raw.seek(compressed_position)
+        if state is None:
+            decompressor, data = zlib.decompressobj(GZIP_WBITS), b''
+        else:
+            decompressor = state.copy()  # O estado guardado não pode ser alterado
+            data = decompressor.unconsumed_tail
+
+        pieces = []
+        remaining = length
+        while remaining > 0 and not decompressor.eof:
+            if not data:
+                data = self.raw.read(READ_SIZE)
+                if not data:
+                    break
+            piece = decompressor.decompress(data, remaining)
+            pieces.append(piece)
+            remaining -= len(piece)
+            data = decompressor.unconsumed_tail
+        return b''.join(pieces)
+
+
+class SeekableZstdFile(_SeekableDecompressedFile):
+    """
+    Acesso aleatório ao conteúdo de um arquivo zstd, de preferência composto por vários
+    frames (como os gerados no formato "seekable zstd" ou por compressão em partes).
+
+    Cada frame é descomprimido de forma independente, então o início de cada frame é um
+    checkpoint. Na abertura, o tamanho descomprimido de cada frame vem da tabela de busca
+    do formato seekable, quando ela está no fim do arquivo, ou do cabeçalho de cada frame;
+    só os frames que não informam o tamanho são descomprimidos para medi-lo. Como o pacote zstandard não permite copiar o estado do descompressor, os
+    frames maiores que checkpoint_interval também são divididos em segmentos, mas ler um
+    desses segmentos exige descomprimir (e descartar) o frame desde o início. A memória
+    usada continua limitada a poucos segmentos; já o tempo de leitura de um arquivo com
+    um único frame grande cresce com a distância entre o trecho lido e o início do arquivo.
+    Requer o pacote zstandard.
+
+    Parâmetros:
+    -----------
+    filename : str
+        Caminho para o arquivo zstd.
+    checkpoint_interval : int
+        Tamanho máximo, em bytes descomprimidos, dos segmentos dentro de um frame.
+    """
+
+    def __init__(self, filename, checkpoint_interval=4 << 20):
+        if zstandard is None:
+            raise ImportError("A leitura de arquivos zstd requer o pacote zstandard (pip install zstandard).")
+        self.checkpoint_interval = checkpoint_interval
+        self._decompressor = zstandard.ZstdDecompressor()
+        super().__init__(filename)
+
+    def _build_index(self):
+        # (posição descomprimida, posição comprimida do frame, bytes a descartar do início do frame)
+        self.checkpoints = []
+        total = 0
+        frames = self._seek_table()
+        if frames is None:
+            frames = self._scan_frames()
+
+        for frame_position, frame_size in frames:
+            self.checkpoints.append((total, frame_position, 0))
+            # Os segmentos dentro do frame podem começar em qualquer posição, então
+            # ficam exatamente a checkpoint_interval bytes uns dos outros
+            for skip in range(self.checkpoint_interval, frame_size, self.checkpoint_interval):
+                self.checkpoints.append((total + skip, frame_position, skip))
+            total += frame_size
+
+        if not self.checkpoints:
+            self.checkpoints.append((0, 0, 0))
+        self.size = total
+
+    def _seek_table(self):
+        """
+        Lê a tabela de busca do formato seekable zstd, gravada em um frame ignorável no fim
+        do arquivo com os tamanhos comprimido e descomprimido de cada frame.
+
+        Retorno:
+            list: (posição comprimida, tamanho descomprimido) de cada frame, ou None se o
+            arquivo não terminar com uma tabela de busca válida
+        """
+        raw = self.raw
+        file_size = raw.seek(0, os.SEEK_END)
+        if file_size < 17:
+            return None
+        raw.seek(file_size - 9)
+        footer = raw.read(9)  # Number_Of_Frames, Seek_Table_Descriptor, Seekable_Magic_Number
+        descriptor = footer[4]
+        if int.from_bytes(footer[5:], 'little') != ZSTD_SEEKABLE_MAGIC or descriptor & 0x7C:
+            return None
+
+        entry_size = 12 if descriptor & 0x80 else 8  # Com checksum, cada entrada tem 4 bytes a mais
+        table_size = int.from_bytes(footer[:4], 'little') * entry_size + 9
+        table_start = file_size - 8 - table_size
+        if table_start < 0:
+            return None
+        raw.seek(table_start)
+        table = raw.read(8 + table_size)
+        if (int.from_bytes(table[:4], 'little') != ZSTD_SEEK_TABLE_MAGIC
+                or int.from_bytes(table[4:8], 'little') != table_size):
+            return None
+
+        frames = []
+        position = 0
+        for offset in range(8, len(table) - 9, entry_size):
+            frames.append((position, int.from_bytes(table[offset + 4:offset + 8], 'little')))
+            position += int.from_bytes(table[offset:offset + 4], 'little')
+        if position != table_start:
+            return None  # A tabela não descreve os frames deste arquivo
+        return frames
+
+    def _scan_frames(self):
+        """
+        Percorre os frames pelos cabeçalhos dos frames e dos blocos, sem descomprimir, usando
+        o tamanho descomprimido gravado no cabeçalho (Frame_Content_Size). Frames sem esse
+        campo (ex: gravados com stream_writer) ou truncados são descomprimidos para medir o tamanho.
+
+        Retorno:
+            iterator: (posição comprimida, tamanho descomprimido) de cada frame
+        """
+        raw = self.raw
+        file_size = raw.seek(0, os.SEEK_END)
+        position = 0
+
+        while True:
+            raw.seek(position)
+            header = raw.read(ZSTD_FRAME_HEADER_MAX)
+            if len(header) < 4:
+                return
+            if int.from_bytes(header[:4], 'little') & 0xFFFFFFF0 == ZSTD_SKIPPABLE_MAGIC:
+                # Frames ignoráveis (ex: a tabela de busca do formato seekable) não têm conteúdo
+                position += 8 + int.from_bytes(header[4:8], 'little')
+                continue
+
+            try:
+                size = zstandard.frame_content_size(header)
+                end = self._frame_end(position, header) if size >= 0 else None
+            except zstandard.ZstdError:
+                end = None  # Cabeçalho truncado ou inválido: a descompressão informa o erro
+            if end is None or end > file_size:
+                end, size = self._decompress_frame(position)
+            yield position, size
+            if end is None:
+                return  # Arquivo truncado
+            position = end
+
+    def _frame_end(self, position, header):
+        """Posição do fim do frame, pulando os blocos pelos cabeçalhos; None se um bloco for inválido."""
+        raw = self.raw
+        has_checksum = zstandard.get_frame_parameters(header).has_checksum
+        position += zstandard.frame_header_size(header)
+        last = False
+        while not last:
+            raw.seek(position)
+            block = raw.read(3)
+            if len(block) < 3:
+                return None
+            # Last_Block (1 bit), Block_Type (2 bits) e Block_Size (21 bits)
+            block_header = int.from_bytes(block, 'little')
+            last = block_header & 1
+            block_type = (block_header >> 1) & 3
+            if block_type == 3:
+                return None
+            # Um bloco RLE guarda um único byte, repetido Block_Size vezes
+            position += 3 + (1 if block_type == 1 else block_header >> 3)
+        return position + (4 if has_checksum else 0)
+
+    def _decompress_frame(self, position):
+        """Descomprime o frame, sem guardar o conteúdo; retorna (posição do fim ou None se truncado, tamanho)."""
+        raw = self.raw
+        raw.seek(position)
+        decompressor = self._decompressor.decompressobj()
+        size = 0
+        while not decompressor.eof:
+            data = raw.read(READ_SIZE)
+            if not data:
+                return None, size
+            position += len(data)
+            size += len(decompressor.decompress(data))
+        return position - len(decompressor.unused_data), size
+
+    def _decompress_segment(self, checkpoint, length):
+        _, compressed_position, skip = checkpoint
+        self.raw.seek(compressed_position)
+        # O leitor produz no máximo READ_SIZE bytes por leitura, então o trecho
+        # descartado nunca fica inteiro na memória
+        reader = self._decompressor.stream_reader(self.raw, read_size=READ_SIZE, read_across_frames=False,
+                                                  closefd=False)
+        while skip > 0:
+            skipped = len(reader.read(min(skip, READ_SIZE)))
+            if not skipped:
+                return b''  # Arquivo truncado
+            skip -= skipped
+        pieces = []
+        remaining = length
+        while remaining > 0:
+            piece = reader.read(min(remaining, READ_SIZE))
+            if not piece:
+                break
+            pieces.append(piece)
+            remaining -= len(piece)
+        return b''.join(pieces)
+
+
+def open_seekable(filename, checkpoint_interval=4 << 20):
+    """
+    Abre um arquivo gzip, zstd ou não comprimido (identificado pelo conteúdo, não pela
+    extensão) como um objeto de arquivo binário com seek sobre o conteúdo descomprimido.
+    """
+    with open(filename, 'rb') as f:
+        magic = f.read(len(ZSTD_MAGIC))
+    if magic.startswith(GZIP_MAGIC):
+        return SeekableGzipFile(filename, checkpoint_interval)
+    if magic == ZSTD_MAGIC:
+        return SeekableZstdFile(filename, checkpoint_interval)
+    return open(filename, 'rb')
+
+
+def last_lines_compressed(filename, buffer_size=READ_SIZE, checkpoint_interval=4 << 20, encoding='utf-8',
+                          errors='replace'):
+    """
+    Semelhante a last_lines, mas também para arquivos comprimidos com gzip ou zstd.
+
+    O arquivo não é descomprimido para um arquivo temporário: os blocos são lidos de trás
+    para frente a partir dos checkpoints (ver SeekableGzipFile e SeekableZstdFile).
+
+    Parâmetros:
+        filename (str): Caminho para o arquivo, comprimido ou não.
+        buffer_size (int): Tamanho dos blocos descomprimidos lidos em bytes.
+        checkpoint_interval (int): Intervalo entre checkpoints de arquivos gzip e entre
+            segmentos dos frames de arquivos zstd.
+        encoding, errors: Codificação do conteúdo e tratamento de bytes inválidos; ver last_line_blocks.
+
+    Retorno:
+        iterator: Iterador sobre as linhas do arquivo em ordem reversa.
+    """
+    with open_seekable(filename, checkpoint_interval) as f:
+        for lines in _line_blocks(f, buffer_size, True, encoding=encoding, errors=errors):
+            for line in lines:
+                yield line + '\n'
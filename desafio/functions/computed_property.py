@@ -1,3 +1,275 @@
+import asyncio
+import threading
+import time
+import types
+from collections import OrderedDict
+from itertools import count
+
+COMPARE_MODES = ('version', 'repr')
+
+# Gerações são valores únicos de um contador global (next() é atômico), e não incrementos
+# por propriedade: duas threads invalidando a mesma propriedade nunca gravam o mesmo valor
+_generations = count(1)
+
+
+def _computed_properties(cls):
+    """
+    Retorna as computed_property de uma classe (inclusive as herdadas), por nome.
+    """
+    properties = {}
+    for klass in reversed(cls.__mro__):
+        for name, value in klass.__dict__.items():
+            if isinstance(value, computed_property):
+                properties[name] = value
+            else:
+                properties.pop(name, None)  # Sobrescrita por um atributo comum na subclasse
+    return properties
+
+
+def _build_dependency_graph(owner):
+    """
+    Monta o grafo de dependências das computed_property de uma classe.
+
+    Guarda na classe, em "_computed_dependents", um dicionário que associa cada nome
+    (atributo ou propriedade) às propriedades no modo 'version' que dependem dele direta
+    ou indiretamente (os objetos computed_property), em ordem topológica. Uma atribuição precisa apenas percorrer essa
+    tupla para invalidar tudo o que deriva do atributo alterado.
+
+    Lança ValueError se houver um ciclo entre as propriedades.
+    """
+    properties = _computed_properties(owner)
+
+    # Detecta ciclos com uma busca em profundidade (0: não visitada, 1: em andamento, 2: concluída)
+    state = dict.fromkeys(properties, 0)
+    order = []  # Propriedades em ordem topológica (dependências antes de dependentes)
+
+    def visit(name, path):
+        if state[name] == 1:
+            cycle = path[path.index(name):] + [name]
+            raise ValueError(f"Dependência circular entre propriedades de {owner.__name__}: {' -> '.join(cycle)}")
+        if state[name] == 0:
+            state[name] = 1
+            for dependency in properties[name].dependencies:
+                if dependency in properties:
+                    visit(dependency, path + [name])
+            state[name] = 2
+            order.append(name)
+
+    for name in properties:
+        visit(name, [])
+
+    # Dependentes diretos e, em seguida, o fecho transitivo de cada nome
+    direct = {}
+    for name in order:
+        for dependency in properties[name].dependencies:
+            direct.setdefault(dependency, []).append(name)
+
+    position = {name: i for i, name in enumerate(order)}
+    dependents = {}
+    for name in direct:
+        reached, pending = set(), list(direct[name])
+        while pending:
+            dependent = pending.pop()
+            if dependent not in reached:
+                reached.add(dependent)
+                pending.extend(direct.get(dependent, ()))
+        versioned = [p for p in reached if properties[p].compare == 'version']
+        if versioned:
+            dependents[name] = tuple(properties[p] for p in sorted(versioned, key=position.__getitem__))
+
+    owner._computed_dependents = dependents
+    for name in order:  # Dependências antes de dependentes, para propagar _volatile
+        prop = properties[name]
+        if owner.__dict__.get(name) is not prop:
+            continue  # Propriedades herdadas mantêm o que foi calculado na classe base
+        if prop.compare == 'version':
+            # Atributos da classe (como @property ou constantes alteradas na classe) não são
+            # atribuídos ao objeto: seus valores são comparados
+            prop._value_dependencies = tuple(
+                dependency for dependency in prop.dependencies
+                if dependency not in properties and _is_class_attribute(owner, dependency)
+            )
+        # Propriedades que mudam sem atribuições precisam ser lidas antes
+        prop._volatile_dependencies = tuple(
+            dependency for dependency in prop.dependencies
+            if dependency in properties and properties[dependency]._volatile
+        )
+        prop._volatile = bool(prop.compare == 'repr' or prop._value_dependencies or prop._volatile_dependencies)
+
+
+def _is_class_attribute(owner, name):
+    """
+    Indica se name é um atributo da classe, como um descritor (ex: @property) ou um valor
+    simples (ex: C.factor = 10), que pode mudar sem uma atribuição ao objeto. Slots não
+    contam: são alterados por atribuições.
+    """
+    for klass in owner.__mro__:
+        if name in klass.__dict__:
+            return not isinstance(klass.__dict__[name], types.MemberDescriptorType)
+    return False
+
+
+def _invalidate_dependents(obj, name):
+    """
+    Marca como desatualizadas, no objeto, as propriedades que dependem de name.
+
+    Cada propriedade no modo 'version' tem uma geração por instância (ver
+    computed_property._set_generation); trocá-la invalida o cache, que é removido e
+    só é recalculado na próxima leitura.
+    """
+    for dependent in getattr(type(obj), '_computed_dependents', {}).get(name, ()):
+        dependent._set_generation(obj, next(_generations))
+        if dependent._get_entry(obj) is not None:
+            dependent._clear_entry(obj)
+            dependent.invalidations += 1  # Só conta se havia um valor em cache
+
+
+def _track_attribute_writes(owner):
+    """
+    Substitui __setattr__ e __delattr__ da classe por versões que, a cada atribuição ou
+    remoção, invalidam as propriedades que dependem do atributo.
+
+    Subclasses herdam as versões substituídas; elas só são instaladas novamente se a
+    subclasse definir seu próprio __setattr__ ou __delattr__.
+    """
+    for method, invalidating in (('__setattr__', _invalidating_setattr), ('__delattr__', _invalidating_delattr)):
+        original = getattr(owner, method)
+        if getattr(original, '_invalidates_dependents', False):
+            continue  # Já substituído nesta classe ou em uma classe base
+        setattr(owner, method, invalidating(original))
+
+
+def _invalidating_setattr(original):
+    def __setattr__(self, name, value):
+        original(self, name, value)
+        _invalidate_dependents(self, name)
+    __setattr__._invalidates_dependents = True
+    return __setattr__
+
+
+class SharedCache:
+    """
+    Cache compartilhado entre as instâncias de uma ou mais computed_property.
+
+    Cada valor é guardado pela chave (propriedade, valores das dependências), e não pela
+    instância: objetos diferentes com as mesmas dependências reaproveitam o mesmo cálculo.
+    Nenhuma referência às instâncias é guardada, então objetos de vida curta continuam
+    sendo liberados normalmente; apenas os valores das dependências e os resultados
+    ficam no cache, limitado a maxsize entradas (as menos usadas recentemente são
+    removidas primeiro) e, opcionalmente, a ttl segundos por entrada.
+
+    Um acerto devolve o mesmo objeto a todas as instâncias com as mesmas dependências,
+    então os resultados devem ser imutáveis (números, strings, tuplas, frozenset...):
+    alterar no lugar o valor lido de uma instância altera o de todas as outras.
+
+    Pode ser usado por várias threads ao mesmo tempo.
+
+    Parâmetros:
+    -----------
+    maxsize : int
+        Número máximo de entradas.
+    ttl : float
+        Tempo de validade de cada entrada, em segundos (None para não expirar).
+    """
+
+    def __init__(self, maxsize=1024, ttl=None):
+        if maxsize <= 0:
+            raise ValueError("maxsize deve ser positivo.")
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()  # chave -> (instante de expiração, valor), da menos para a mais usada
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        """
+        Retorna o valor da chave, ou default se ela não estiver no cache ou tiver expirado.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and (entry[0] is None or entry[0] > time.monotonic()):
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            if entry is not None:
+                del self._entries[key]  # Expirada
+            self.misses += 1
+            return default
+
+    def set(self, key, value):
+        """
+        Guarda o valor da chave, removendo a entrada menos usada se o cache estiver cheio.
+        """
+        expires = None if self.ttl is None else time.monotonic() + self.ttl
+        with self._lock:
+            self._entries[key] = (expires, value)
+            self._entries.move_to_end(key)
+            if len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+
+_MISSING = object()
+
+
+class _Flight:
+    """
+    Cálculo em andamento de uma propriedade em um objeto, aguardado pelas outras threads.
+    """
+
+    def __init__(self):
+        self.thread = threading.get_ident()  # Thread que está calculando
+        self.done = threading.Event()
+        self.error = None
+
+
+class _Ready:
+    """
+    Valor já calculado, que pode ser aguardado com await sem suspender a corrotina.
+    """
+    __slots__ = ('value',)
+
+    def __init__(self, value):
+        self.value = value
+
+    def __await__(self):
+        return self.value
+        yield  # Torna __await__ um gerador, como exigido pelo protocolo de await
+
+
+def _invalidating_delattr(original):
+    def __delattr__(self, name):
+        original(self, name)
+        _invalidate_dependents(self, name)
+    __delattr__._invalidates_dependents = True
+    return __delattr__
+
+
+class _MissingSlots:
+    """
+    Ocupa o lugar dos slots de cache (computed_property._slots) em classes com __slots__,
+    sem __dict__, que não foram decoradas com computed_slots: em vez de um AttributeError
+    sobre __dict__, o primeiro uso do cache gera um erro que explica o que falta.
+    """
+
+    def __init__(self, owner):
+        self.owner = owner.__name__
+
+    def __getitem__(self, index):
+        raise TypeError(
+            f"A classe {self.owner} define __slots__ e não tem __dict__ para guardar o cache das "
+            "computed_property: decore-a com @computed_slots."
+        )
+
+
 class computed_property:
     """
     Um decorator semelhante ao @property, mas com um cache baseado em suas dependências.
@@ -5,20 +277,71 @@ class computed_property:
     O valor da propriedade é calculado uma única vez e armazenado em cache,
     sendo recalculado apenas quando algum dos atributos dependentes for alterado.
 
-    A estrutura de cache é armazenada no atributo interno do objeto chamado "_computed_cache".
+    O cache de cada propriedade é armazenado nos atributos internos do objeto
+    "_computed_<nome>" e "_generation_<nome>" (em slots, em classes com __slots__
+    decoradas com computed_slots). Os valores guardados são imutáveis, então cópias
+    do objeto (copy.copy) não compartilham o cache. O método stats() informa acertos,
+    recálculos e invalidações do cache.
+
+    Por padrão (compare='version'), as atribuições aos atributos dependentes são
+    rastreadas: ao criar a classe, seu __setattr__ passa a incrementar a geração de
+    cada propriedade que depende do atributo alterado, e o cache é válido enquanto a
+    geração não mudar. Verificar o cache custa apenas a comparação de um inteiro,
+    qualquer que seja o tamanho dos valores. Dependências que não são atribuídas ao
+    objeto, mas lidas da classe (um descritor como @property ou um atributo simples,
+    como C.factor = 10), não podem ser rastreadas: seus valores são comparados por
+    repr() a cada acesso. Só são reconhecidos os atributos que já existem na classe
+    quando ela é criada; um atributo acrescentado depois à classe não é percebido.
+
+    Uma dependência pode ser outra computed_property da mesma classe. As propriedades
+    formam um grafo de dependências, montado na criação da classe (dependências
+    circulares geram um erro), e a invalidação é transitiva: alterar x invalida
+    magnitude e tudo o que depende de magnitude, sem recalcular nada até a próxima leitura.
+
+    A propriedade pode ser lida por várias threads ao mesmo tempo: se o cache estiver
+    desatualizado, apenas uma delas executa o getter para cada objeto, e as demais
+    aguardam e recebem o mesmo resultado (ou a mesma exceção). Leituras de valores
+    em cache não usam nenhum lock.
+
+    Alterações que não passam por uma atribuição, como
+    modificar uma lista dependente no lugar (ex: self.items.append(...)), não são
+    percebidas; para esses casos, compare='repr' compara o repr() dos valores das
+    dependências a cada acesso, como nas versões anteriores.
 
     Parâmetros:
     -----------
     *dependencies : str
         Nomes dos atributos dos quais a propriedade depende.
+    compare : str
+        'version' (padrão) para rastrear atribuições ou 'repr' para comparar o repr()
+        dos valores das dependências a cada acesso.
+    shared_cache : SharedCache
+        Cache compartilhado entre instâncias (opcional). Antes de executar o getter, o
+        valor é procurado pelos valores atuais das dependências, que devem ser hashable
+        (caso contrário, o cache compartilhado é ignorado naquela leitura). Só deve ser
+        usado quando o resultado depende apenas das dependências declaradas e é
+        imutável, já que o mesmo objeto é devolvido a todas as instâncias.
     """
 
-    def __init__(self, *dependencies):
+    def __init__(self, *dependencies, compare='version', shared_cache=None):
+        if compare not in COMPARE_MODES:
+            raise ValueError(f"compare deve ser um de {COMPARE_MODES}, não {compare!r}.")
         self.dependencies = dependencies # Lista de atributos dos quais a propriedade depende
+        self.compare = compare           # Forma de verificar se as dependências mudaram
         self.fget = None                 # Função getter
         self.fset = None                 # Função setter
         self.fdel = None                 # Função deleter
         self.__doc__ = None              # Docstring preservada
+        self.name = None                 # Nome do atributo na classe
+        self._versioned = False          # Se as atribuições às dependências estão sendo rastreadas
+        self._value_dependencies = ()    # Dependências comparadas por repr() no modo 'version'
+        self._volatile_dependencies = () # Dependências que são propriedades voláteis
+        self._volatile = compare == 'repr' # Se o valor pode mudar sem atribuições às dependências
+        self._lock = threading.Lock()    # Protege self._flights
+        self._flights = {}               # id(objeto) -> _Flight do cálculo em andamento
+        self.shared_cache = shared_cache # Cache compartilhado entre instâncias (opcional)
+        self._slots = None               # (slot do cache, slot da geração), ver computed_slots
+        self.reset_stats()
 
     def __call__(self, func):
         """
@@ -26,8 +349,88 @@ class computed_property:
         """
         self.fget = func
         self.__doc__ = func.__doc__
+        self.name = self.name or func.__name__
+        self._entry_key = f'_computed_{self.name}'
+        self._generation_key = f'_generation_{self.name}'
         return self
 
+    def __set_name__(self, owner, name):
+        """
+        Executado na criação da classe: monta o grafo de dependências da classe (na
+        primeira propriedade, quando todas já estão na classe) e passa a rastrear as
+        atribuições às dependências.
+
+        Uma propriedade atribuída à classe depois de criada não passa por aqui e,
+        por segurança, usa a comparação por repr().
+        """
+        self.name = name
+        self._entry_key = f'_computed_{name}'
+        self._generation_key = f'_generation_{name}'
+        if '_computed_dependents' not in owner.__dict__:
+            _build_dependency_graph(owner)
+        if self.compare == 'version':
+            _track_attribute_writes(owner)
+            self._versioned = True
+        if not any('__dict__' in klass.__dict__ for klass in owner.__mro__):
+            # O decorator computed_slots só é aplicado depois da criação da classe, que passa
+            # por aqui antes dele: o erro fica para o primeiro uso, e computed_slots o substitui
+            self._slots = _MissingSlots(owner)
+
+    def _dependency_state(self, obj):
+        """
+        Estado atual das dependências: a geração da propriedade (com o repr() das
+        dependências que não podem ser rastreadas, se houver) ou a tupla de repr() dos valores.
+        """
+        if self._versioned:
+            for dependency in self._volatile_dependencies:
+                getattr(obj, dependency)  # Se mudou, a propriedade invalida seus dependentes
+            if self._value_dependencies:
+                values = tuple(repr(getattr(obj, dep, object())) for dep in self._value_dependencies)
+                return self._generation(obj), values
+            return self._generation(obj)
+        return tuple(repr(getattr(obj, dep, object())) for dep in self.dependencies)
+
+    # Armazenamento por instância: a entrada (estado das dependências, valor) e a geração
+    # da propriedade. Por padrão, ficam no __dict__ do objeto, gravadas diretamente (sem
+    # passar pelo __setattr__ da classe) em "_computed_<nome>" e "_generation_<nome>";
+    # em classes decoradas com computed_slots, em slots com esses mesmos nomes. Cada
+    # valor é imutável e substituído por inteiro, então uma cópia rasa do objeto pode
+    # ser alterada sem afetar o cache do original.
+
+    def _get_entry(self, obj):
+        if self._slots is not None:
+            try:
+                return self._slots[0].__get__(obj)
+            except AttributeError:
+                return None
+        return obj.__dict__.get(self._entry_key)
+
+    def _set_entry(self, obj, entry):
+        if self._slots is not None:
+            self._slots[0].__set__(obj, entry)
+            return
+        obj.__dict__[self._entry_key] = entry
+
+    def _clear_entry(self, obj):
+        if self._slots is not None:
+            self._slots[0].__set__(obj, None)
+            return
+        obj.__dict__.pop(self._entry_key, None)
+
+    def _generation(self, obj):
+        if self._slots is not None:
+            try:
+                return self._slots[1].__get__(obj)
+            except AttributeError:
+                return 0
+        return obj.__dict__.get(self._generation_key, 0)
+
+    def _set_generation(self, obj, generation):
+        if self._slots is not None:
+            self._slots[1].__set__(obj, generation)
+            return
+        obj.__dict__[self._generation_key] = generation
+
     def __get__(self, obj, objtype=None):
         """
         Executado ao acessar a propriedade no objeto.
@@ -38,35 +441,123 @@ class computed_property:
         if obj is None:
             return self
 
-        # Garante que o dicionário de cache está presente
-        if not hasattr(obj, "_computed_cache"):
-            obj._computed_cache = {}
+        while True:
+            # Estado atual das dependências (geração ou repr dos valores)
+            current_deps = self._dependency_state(obj)
 
-        key = self.fget.__name__  # Nome da propriedade (ex: "diameter" para uma classe Circle)
+            # Se as dependências não mudaram, retorna o valor cacheado
+            cache_entry = self._get_entry(obj)
+            if cache_entry and cache_entry[0] == current_deps:
+                self.hits += 1
+                return cache_entry[1]
+            self.misses += 1
 
-        # Valores atuais das dependências
-        current_deps = tuple(repr(getattr(obj, dep, object())) for dep in self.dependencies)
+            # Caso contrário, apenas uma thread recalcula; as demais aguardam o resultado
+            with self._lock:
+                flight = self._flights.get(id(obj))
+                leader = flight is None
+                if leader:
+                    flight = self._flights[id(obj)] = _Flight()
 
-        # Recupera o cache (dependências anteriores + valor)
-        cache_entry = obj._computed_cache.get(key)
+            if leader:
+                return self._compute(obj, current_deps, flight)
+            if flight.thread == threading.get_ident():
+                raise RuntimeError(f"A propriedade '{self.name}' depende de si mesma.")
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            # O valor calculado corresponde ao estado lido pela outra thread: verifica novamente
 
-        # Se as dependências não mudaram, retorna o valor cacheado
-        if cache_entry:
-            old_deps, cached_value = cache_entry
-            if old_deps == current_deps:
-                return cached_value
+    def _shared_key(self, obj):
+        """
+        Chave do valor no cache compartilhado: a propriedade e os valores (e tipos, já que
+        1 == 1.0 == True) das dependências. Retorna None se não houver cache compartilhado
+        ou se algum valor não for hashable.
+        """
+        if self.shared_cache is None:
+            return None
+        values = tuple(getattr(obj, dep, None) for dep in self.dependencies)
+        key = (self, values, tuple(map(type, values)))
+        try:
+            hash(key)
+        except TypeError:
+            return None
+        return key
+
+    def _compute(self, obj, current_deps, flight):
+        """
+        Executa o getter e atualiza o cache, liberando em seguida as threads que aguardam.
+        """
+        try:
+            cache_entry = self._get_entry(obj)
+            if cache_entry and cache_entry[0] == current_deps:
+                return cache_entry[1]  # Outra thread terminou o cálculo logo antes
+            if cache_entry:
+                self.invalidations += 1  # Mudanças sem atribuição só são percebidas aqui
+            shared_key = self._shared_key(obj)
+            value = _MISSING if shared_key is None else self.shared_cache.get(shared_key, _MISSING)
+            if value is _MISSING:
+                start = time.perf_counter()
+                value = self.fget(obj)
+                self._record_computation(time.perf_counter() - start)
+                if shared_key is not None:
+                    self.shared_cache.set(shared_key, value)
+            self._set_entry(obj, (current_deps, value))
+        except BaseException as error:
+            flight.error = error
+            raise
+        finally:
+            with self._lock:
+                del self._flights[id(obj)]
+            flight.done.set()
 
-        # Caso contrário, recalcula, atualiza o cache e retorna o novo valor
-        value = self.fget(obj)
-        obj._computed_cache[key] = (current_deps, value)
+        if self._volatile:
+            # Sem uma atribuição, a mudança só é percebida na leitura: invalida os dependentes agora
+            _invalidate_dependents(obj, self.name)
         return value
 
+    def _record_computation(self, elapsed):
+        self.computations += 1
+        self.recompute_time += elapsed
+
     def _invalidate_cache(self, obj):
         """
-        Remove a entrada correspondente à propriedade no dicionário de cache do objeto.
+        Remove a entrada correspondente à propriedade do cache do objeto.
         """
-        if hasattr(obj, "_computed_cache"):
-            obj._computed_cache.pop(self.fget.__name__, None)
+        if self._get_entry(obj) is not None:
+            self._clear_entry(obj)
+            self.invalidations += 1  # Só conta se havia um valor em cache, como em _invalidate_dependents
+        _invalidate_dependents(obj, self.name)
+
+    def stats(self):
+        """
+        Estatísticas de uso da propriedade, somadas entre todas as instâncias.
+
+        Os contadores não usam lock, então leituras concorrentes podem ser contadas
+        a menos; servem para encontrar propriedades muito recalculadas, não para contabilidade.
+
+        Retorno:
+        - Dicionário com hits (leituras do cache), misses (leituras com cache ausente ou
+          desatualizado), computations (execuções do getter), recompute_time (tempo total
+          dessas execuções, em segundos) e invalidations (invalidações do cache)
+        """
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'computations': self.computations,
+            'recompute_time': self.recompute_time,
+            'invalidations': self.invalidations,
+        }
+
+    def reset_stats(self):
+        """
+        Zera as estatísticas da propriedade.
+        """
+        self.hits = 0
+        self.misses = 0
+        self.computations = 0
+        self.recompute_time = 0.0
+        self.invalidations = 0
 
     def setter(self, fset):
         """
@@ -106,3 +597,132 @@ class computed_property:
             )
         self.fdel(obj)
         self._invalidate_cache(obj)
+
+
+def computed_slots(cls):
+    """
+    Decorator de classe que guarda o cache das computed_property em slots.
+
+    Para classes com __slots__, que não têm __dict__ e por isso não poderiam guardar o
+    cache: a classe é recriada com dois slots a mais por propriedade definida nela, um
+    para a entrada (estado das dependências, valor) e outro para a geração. Sem nenhum
+    dicionário por objeto, cada instância ocupa bem menos memória, o que faz diferença
+    com milhões de instâncias.
+
+    Parâmetros:
+    -----------
+    cls : type
+        Classe com __slots__.
+
+    Retorno:
+    - A nova classe, com os mesmos atributos e métodos
+    """
+    if '__slots__' not in cls.__dict__:
+        raise TypeError(f"computed_slots requer uma classe com __slots__, e {cls.__name__} não define __slots__.")
+
+    slots = cls.__dict__['__slots__']
+    slots = (slots,) if isinstance(slots, str) else tuple(slots)
+    properties = {name: value for name, value in cls.__dict__.items() if isinstance(value, computed_property)}
+    property_slots = {name: (f'_computed_{name}', f'_generation_{name}') for name in properties}
+
+    # Os descritores dos slots originais são recriados pela nova classe
+    excluded = {*slots, '__dict__', '__weakref__', '_computed_dependents'}
+    namespace = {name: value for name, value in cls.__dict__.items() if name not in excluded}
+    namespace['__slots__'] = slots + tuple(slot for pair in property_slots.values() for slot in pair)
+    namespace['__qualname__'] = cls.__qualname__
+    new_cls = type(cls)(cls.__name__, cls.__bases__, namespace)
+
+    # Métodos que usam super() sem argumentos referenciam a classe original em __class__.
+    # As funções guardadas em closures também são percorridas: o __setattr__ e o
+    # __delattr__ da classe já foram substituídos, e os originais só existem na closure
+    pending = []
+    for value in namespace.values():
+        pending.extend((value, getattr(value, '__func__', None), getattr(value, 'fget', None),
+                        getattr(value, 'fset', None), getattr(value, 'fdel', None)))
+    visited = set()
+    while pending:
+        function = pending.pop()
+        if id(function) in visited:
+            continue
+        visited.add(id(function))
+        for cell in getattr(function, '__closure__', None) or ():
+            try:
+                contents = cell.cell_contents
+            except ValueError:
+                continue  # Célula ainda vazia
+            if contents is cls:
+                cell.cell_contents = new_cls
+            elif isinstance(contents, types.FunctionType):
+                pending.append(contents)
+
+    for name, prop in properties.items():
+        entry_slot, generation_slot = property_slots[name]
+        prop._slots = (new_cls.__dict__[entry_slot], new_cls.__dict__[generation_slot])
+    return new_cls
+
+
+def stats(cls):
+    """
+    Estatísticas de todas as computed_property de uma classe (inclusive as herdadas).
+
+    Retorno:
+    - Dicionário que associa o nome de cada propriedade ao resultado de seu método stats()
+    """
+    return {name: prop.stats() for name, prop in _computed_properties(cls).items()}
+
+
+class async_computed_property(computed_property):
+    """
+    Variante de computed_property para getters assíncronos (async def).
+
+    Ler a propriedade retorna um objeto que deve ser aguardado: `await obj.propriedade`.
+    Se o valor em cache ainda é válido, ele é retornado sem suspender a corrotina.
+    Caso contrário, o getter é executado em uma Task; leituras concorrentes enquanto
+    ela está em andamento (com as mesmas dependências) aguardam a mesma Task, então o
+    getter é executado uma única vez. Cada leitura aguarda a Task através de
+    asyncio.shield: cancelar quem está aguardando não cancela o cálculo.
+
+    Deve ser lida de dentro de um event loop em execução. Os parâmetros são os mesmos
+    de computed_property.
+    """
+
+    def __init__(self, *dependencies, compare='version', shared_cache=None):
+        super().__init__(*dependencies, compare=compare, shared_cache=shared_cache)
+        self._tasks = {}  # id(objeto) -> (estado das dependências, Task do cálculo em andamento)
+
+    def __get__(self, obj, objtype=None):
+        if obj is None:
+            return self
+
+        current_deps = self._dependency_state(obj)
+        cache_entry = self._get_entry(obj)
+        if cache_entry and cache_entry[0] == current_deps:
+            self.hits += 1
+            return _Ready(cache_entry[1])
+        self.misses += 1
+
+        running = self._tasks.get(id(obj))
+        if running is None or running[0] != current_deps:
+            task = asyncio.get_running_loop().create_task(self._compute_async(obj, current_deps))
+            running = self._tasks[id(obj)] = (current_deps, task)
+            task.add_done_callback(lambda task, key=id(obj): self._task_done(key, task))
+        return asyncio.shield(running[1])
+
+    def _task_done(self, key, task):
+        running = self._tasks.get(key)
+        if running is not None and running[1] is task:
+            del self._tasks[key]
+
+    async def _compute_async(self, obj, current_deps):
+        shared_key = self._shared_key(obj)
+        value = _MISSING if shared_key is None else self.shared_cache.get(shared_key, _MISSING)
+        if value is _MISSING:
+            start = time.perf_counter()
+            value = await self.fget(obj)
+            self._record_computation(time.perf_counter() - start)
+            if shared_key is not None:
+                self.shared_cache.set(shared_key, value)
+        self._set_entry(obj, (current_deps, value))
+        if self._volatile:
+            _invalidate_dependents(obj, self.name)
+        return value
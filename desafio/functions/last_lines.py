@@ -1,60 +1,536 @@
+import asyncio
+import codecs
 import io
+import mmap
 import os
+import struct
+import time
+from array import array
+from itertools import islice
 
-def last_lines(filename, buffer_size=io.DEFAULT_BUFFER_SIZE):
+
+MAX_BUFFER_SIZE = 1 << 20  # Limite do crescimento dos blocos lidos por last_lines
+
+
+def _reverse_line_blocks(f, buffer_size, max_buffer_size=None, pread=False, readahead=False, newline=b'\n',
+                         begin=0):
+    """
+    Lê um arquivo aberto em modo binário de trás para frente, em blocos de buffer_size bytes.
+
+    Cada bloco retornado contém apenas linhas completas (começa no início de uma linha e
+    termina logo após uma quebra de linha ou no fim do arquivo). O trecho inicial de cada
+    bloco lido, que pertence a uma linha iniciada antes dele, é guardado e juntado ao bloco
+    anterior do arquivo. Uma linha maior que buffer_size é acumulada em uma lista de pedaços
+    e juntada uma única vez, então o custo continua linear mesmo para linhas muito longas.
+
+    Se max_buffer_size for maior que buffer_size, o tamanho dos blocos dobra a cada leitura
+    até max_buffer_size: as primeiras linhas saem depois de uma leitura pequena, e um
+    arquivo grande lido até o fim custa poucas chamadas de sistema.
+
+    Com pread, cada bloco é lido com uma única chamada os.pread, em vez de seek e read.
+    Com readahead, o sistema é avisado (posix_fadvise) de que o bloco seguinte, que está
+    antes do atual no arquivo, será lido, já que a leitura antecipada do sistema operacional
+    só considera leituras para frente. As duas opções exigem um arquivo com fileno e são
+    ignoradas nas plataformas em que não estão disponíveis.
+
+    newline é a quebra de linha já codificada. Quando ela tem mais de um byte (UTF-16,
+    UTF-32), as leituras começam sempre em posições múltiplas do seu tamanho e só as
+    ocorrências alinhadas são consideradas, já que os mesmos bytes podem aparecer no meio
+    de outros caracteres. Os bytes antes de begin (ex: o BOM) não são lidos.
+    """
+    unit = len(newline)
+    max_buffer_size = max(buffer_size, max_buffer_size or buffer_size)
+    pread = pread and hasattr(os, 'pread')
+    readahead = readahead and hasattr(os, 'posix_fadvise')
+    fd = f.fileno() if pread or readahead else None
+
+    f.seek(0, os.SEEK_END)
+    position = f.tell()
+    pending = []  # Pedaços (em ordem reversa) da linha que começa antes da posição atual
+
+    while position > begin:
+        end = position
+        position = max(begin, position - buffer_size)  # Move o ponteiro para o início do próximo bloco
+        position -= (position - begin) % unit
+        read_size = end - position
+        buffer_size = min(buffer_size * 2, max_buffer_size)
+        if readahead and position > begin:
+            next_position = max(begin, position - buffer_size)
+            os.posix_fadvise(fd, next_position, position - next_position, os.POSIX_FADV_WILLNEED)
+        if pread:
+            chunk = os.pread(fd, read_size, position)
+        else:
+            f.seek(position)
+            chunk = f.read(read_size)
+
+        if position == begin:
+            start = 0  # Início do arquivo: todo o bloco é composto de linhas completas
+        else:
+            start = chunk.find(newline)
+            while start > 0 and start % unit:
+                start = chunk.find(newline, start + 1)  # Ocorrência desalinhada, no meio de um caractere
+            start += unit
+            if start < unit:
+                pending.append(chunk)  # O bloco inteiro está no meio de uma linha
+                continue
+
+        block = chunk[start:]
+        if pending:
+            pending.append(block)
+            block = b''.join(reversed(pending))
+        pending = [chunk[:start]]
+        if block:
+            yield block
+
+
+BOMS = {
+    'utf-8': [(codecs.BOM_UTF8, 'utf-8')],
+    'utf-8-sig': [(codecs.BOM_UTF8, 'utf-8')],
+    'utf-16': [(codecs.BOM_UTF16_LE, 'utf-16-le'), (codecs.BOM_UTF16_BE, 'utf-16-be')],
+    'utf-32': [(codecs.BOM_UTF32_LE, 'utf-32-le'), (codecs.BOM_UTF32_BE, 'utf-32-be')],
+}
+
+
+def _detect_encoding(f, encoding):
+    """
+    Identifica o codec usado para decodificar os blocos de um arquivo e o tamanho do seu BOM.
+
+    Para 'utf-8', 'utf-8-sig', 'utf-16' e 'utf-32' o BOM, se presente, é pulado e, nos dois
+    últimos, define a ordem dos bytes (sem BOM, little-endian). Os blocos são decodificados
+    com um codec de ordem fixa, já que apenas o início do arquivo tem BOM.
+
+    Retorno:
+        tuple: (nome do codec, tamanho do BOM em bytes)
+    """
+    name = codecs.lookup(encoding).name
+    if name not in BOMS:
+        return name, 0
+    f.seek(0)
+    head = f.read(4)
+    for bom, codec in BOMS[name]:
+        if head.startswith(bom):
+            return codec, len(bom)
+    return BOMS[name][0][1], 0
+
+
+def last_line_blocks(filename, buffer_size=io.DEFAULT_BUFFER_SIZE, decode=True, max_buffer_size=MAX_BUFFER_SIZE,
+                     pread=False, readahead=False, encoding='utf-8', errors='replace'):
+    """
+    Retorna as linhas de um arquivo em ordem reversa, agrupadas em listas (uma por bloco lido).
+
+    A decodificação e a remoção de '\r' são feitas uma única vez por bloco, e não por linha,
+    e cada linha é retornada sem o caractere de nova linha. Linhas vazias são ignoradas.
+    Os blocos sempre começam e terminam em uma quebra de linha, então nenhum caractere
+    multibyte é dividido entre dois blocos.
+
+    Parâmetros:
+        filename (str): Caminho para o arquivo de texto.
+        buffer_size (int): Tamanho do primeiro bloco lido em bytes.
+        decode (bool): Se False, as linhas são retornadas como bytes, sem nenhuma
+            conversão (inclusive mantendo '\r'); nesse caso o arquivo deve usar uma
+            codificação compatível com ASCII.
+        max_buffer_size (int): Tamanho máximo dos blocos, que dobram a cada leitura a partir
+            de buffer_size (None para manter todos os blocos com buffer_size bytes).
+        pread (bool): Lê cada bloco com os.pread (uma chamada de sistema em vez de duas).
+        readahead (bool): Pede ao sistema a leitura antecipada do bloco anterior (posix_fadvise).
+        encoding (str): Codificação do arquivo (ex: 'utf-8', 'utf-16', 'latin-1'). O BOM de
+            arquivos UTF-8, UTF-16 e UTF-32 é identificado e removido.
+        errors (str): Tratamento de bytes inválidos, como em bytes.decode. Com 'replace', o
+            padrão, eles aparecem como '\ufffd' em vez de serem descartados.
+
+    Retorno:
+        iterator: Iterador sobre listas de linhas; as listas e as linhas dentro de cada
+        lista estão em ordem reversa.
+    """
+    with open(filename, 'rb') as f:
+        yield from _line_blocks(f, buffer_size, decode, max_buffer_size, pread, readahead, encoding, errors)
+
+
+def _line_blocks(f, buffer_size, decode, max_buffer_size=None, pread=False, readahead=False, encoding='utf-8',
+                 errors='replace'):
+    """
+    Implementação de last_line_blocks para qualquer objeto de arquivo com seek, tell e read.
+    """
+    if not decode:
+        for block in _reverse_line_blocks(f, buffer_size, max_buffer_size, pread, readahead):
+            lines = block.split(b'\n')
+            lines.reverse()
+            yield [line for line in lines if line]
+        return
+
+    codec, bom_size = _detect_encoding(f, encoding)
+    newline = '\n'.encode(codec)
+    for block in _reverse_line_blocks(f, buffer_size, max_buffer_size, pread, readahead, newline, bom_size):
+        lines = block.decode(codec, errors).replace('\r', '').split('\n')
+        lines.reverse()
+        yield [line for line in lines if line]
+
+
+def last_lines_bytes(filename, buffer_size=io.DEFAULT_BUFFER_SIZE, max_buffer_size=MAX_BUFFER_SIZE, pread=False,
+                     readahead=False):
+    """
+    Variante de last_lines que retorna as linhas como bytes, sem decodificar, sem remover
+    '\r' e sem o caractere de nova linha.
+
+    Parâmetros:
+        filename (str): Caminho para o arquivo.
+        buffer_size (int): Tamanho do primeiro bloco lido em bytes.
+        max_buffer_size, pread, readahead: Opções de leitura; ver last_line_blocks.
+
+    Retorno:
+        iterator: Iterador sobre as linhas do arquivo em ordem reversa.
+    """
+    for lines in last_line_blocks(filename, buffer_size, False, max_buffer_size, pread, readahead):
+        yield from lines
+
+
+def last_lines(filename, buffer_size=io.DEFAULT_BUFFER_SIZE, max_buffer_size=MAX_BUFFER_SIZE, pread=False,
+               readahead=False, encoding='utf-8', errors='replace'):
     """
     Retorna um iterador sobre as linhas de um arquivo em ordem reversa,
     semelhante ao comando Unix `tac`, mantendo os caracteres de nova linha.
-    Aplica fix para arquivos Windows, removendo '\r'.
+    Aplica fix para arquivos Windows, removendo '\r'. Linhas vazias são ignoradas.
+
+    Parâmetros:
+        filename (str): Caminho para o arquivo de texto.
+        buffer_size (int): Tamanho do primeiro bloco lido em bytes.
+        max_buffer_size, pread, readahead: Opções de leitura; ver last_line_blocks.
+        encoding, errors: Codificação do arquivo e tratamento de bytes inválidos; ver last_line_blocks.
+
+    Retorno:
+        iterator: Iterador sobre as linhas do arquivo em ordem reversa.
+    """
+    for lines in last_line_blocks(filename, buffer_size, True, max_buffer_size, pread, readahead, encoding, errors):
+        for line in lines:
+            yield line + '\n'
+
+
+def last_lines_mmap(filename):
+    """
+    Variante de last_lines que mapeia o arquivo em memória (mmap) em vez de ler blocos.
+
+    As quebras de linha são localizadas de trás para frente com rfind e cada linha é
+    decodificada diretamente de uma fatia de memoryview, sem acumular um buffer: o custo
+    é proporcional ao tamanho do arquivo mesmo quando as linhas são muito longas.
+    Assim como em last_lines, linhas vazias são ignoradas.
 
     Parâmetros:
         filename (str): Caminho para o arquivo de texto.
-        buffer_size (int): Tamanho dos blocos lidos em bytes.
 
     Retorno:
         iterator: Iterador sobre as linhas do arquivo em ordem reversa.
     """
     with open(filename, 'rb') as f:
-        f.seek(0, os.SEEK_END)
-        file_size = f.tell()
-        buffer = b""
-        position = file_size
-
-        while position > 0:
-            # Tamanho do bloco a ser lido.
-            read_size = min(buffer_size, position)
-            position -= read_size # Move o ponteiro para o início do próximo bloco
-            f.seek(position)
-            chunk = f.read(read_size) 
-            buffer = chunk + buffer # Novo chunk vem "antes" do que o que já está no buffer
-            # a variável buffer vai ultrapassar o tamanho de buffer_size, pois precisa armazenar o que foi lido
-            # até que chegue o final da linha, do contrário, teriamos que retornar linhas quebradas.
-
-            # Divide o buffer em uma lista de linhas usando o caractere de nova linha.
-            # Ex: b'\nlinhaB\n'.split(b'\n') -> [b'', b'linhaB', b'']
-            lines = buffer.split(b'\n')
-
-            # Guarda o começo da linha para levar para a próxima iteração
-            buffer = lines.pop(0)
-
-            for line in reversed(lines):
-                if line:
-                    """Decodifica de bytes para string (UTF-8), substitui caracteres problemáticos,
-                       remove '\r' (de quebras de linha do Windows) e adiciona um '\n' ao final."""
-                    yield line.decode('utf-8', errors='ignore').replace('\r', '') + '\n'
-
-                elif position > 0 or (file_size == len(chunk) and len(lines) > 0):
-                    """Verifica se a linha vazia (b'') deve ser ignorada.
-                       Ela tenta filtrar o b'' gerado por split() quando o arquivo termina com '\n'.
-                       Se 'position > 0': Ainda há mais arquivo para ler (não chegou no início).
-                       Se 'file_size == len(chunk) and len(lines) > 0': o arquivo é pequeno
-                       e foi lido em um único chunk (position == 0)."""
-                    pass
-
-                else:
-                    """Se não for uma linha vazia que deve ser ignorada (ou seja, é uma linha vazia real),
-                   então a renderiza uma quebra de linha."""
-                    yield '\n'
-
-        if buffer:
-            yield buffer.decode('utf-8', errors='ignore').replace('\r', '') + '\n'
+        yield from _mmap_last_lines(f, os.fstat(f.fileno()).st_size)
+
+
+def _mmap_last_lines(f, size):
+    """
+    Itera em ordem reversa sobre as linhas dos primeiros size bytes de um arquivo já aberto.
+    """
+    if size == 0:
+        return  # Arquivos vazios não podem ser mapeados
+
+    with mmap.mmap(f.fileno(), size, access=mmap.ACCESS_READ) as mapped, memoryview(mapped) as view:
+        end = size
+        while end > 0:
+            start = mapped.rfind(b'\n', 0, end) + 1  # rfind retorna -1 quando não há mais quebras
+            line = str(view[start:end], 'utf-8', 'replace').replace('\r', '')
+            if line:  # Linhas vazias são ignoradas
+                yield line + '\n'
+            end = start - 1
+
+
+def tail(filename, n=10):
+    """
+    Retorna as últimas n linhas de um arquivo, na ordem em que aparecem nele, como o comando `tail -n`.
+
+    Usa last_lines_mmap, então apenas as páginas do final do arquivo que contêm as
+    n linhas são efetivamente lidas do disco.
+
+    Parâmetros:
+        filename (str): Caminho para o arquivo de texto.
+        n (int): Quantidade de linhas.
+
+    Retorno:
+        list: As últimas n linhas do arquivo.
+    """
+    lines = list(islice(last_lines_mmap(filename), n))
+    lines.reverse()
+    return lines
+
+
+class LineIndex:
+    """
+    Índice persistente das posições das linhas de um arquivo, para acesso direto a qualquer linha.
+
+    O índice guarda, para cada linha não vazia, o byte onde ela começa e o byte da sua
+    quebra de linha (ou do fim do arquivo). Ele é gravado em um arquivo auxiliar ao lado
+    do original (por padrão `<arquivo>.lineidx`) e reaproveitado enquanto o tamanho e a
+    data de modificação do arquivo não mudarem; caso contrário, é reconstruído. Se o
+    arquivo auxiliar não puder ser gravado (ex: diretório somente leitura), o índice é
+    usado apenas em memória. Com o índice, ler qualquer linha custa um único seek.
+
+    Parâmetros:
+    -----------
+    filename : str
+        Caminho para o arquivo de texto.
+    index_filename : str
+        Caminho do arquivo auxiliar do índice.
+    """
+
+    HEADER = struct.Struct('<8sqqq')  # assinatura, tamanho do arquivo, mtime em ns, quantidade de linhas
+    MAGIC = b'LINEIDX1'
+    BLOCK_SIZE = 1 << 20
+
+    def __init__(self, filename, index_filename=None):
+        self.filename = filename
+        self.index_filename = index_filename or filename + '.lineidx'
+        stat = os.stat(filename)
+        self.file_size, self.mtime_ns = stat.st_size, stat.st_mtime_ns
+
+        if not self._load():
+            self._build()
+            self._save()
+
+    def _load(self):
+        """
+        Carrega o índice do arquivo auxiliar, se ele existir e corresponder ao arquivo atual.
+        """
+        try:
+            with open(self.index_filename, 'rb') as f:
+                header = f.read(self.HEADER.size)
+                if len(header) != self.HEADER.size:
+                    return False
+                magic, file_size, mtime_ns, count = self.HEADER.unpack(header)
+                if (magic, file_size, mtime_ns) != (self.MAGIC, self.file_size, self.mtime_ns):
+                    return False
+                if not 0 <= count <= file_size:  # Cada linha tem pelo menos um byte
+                    return False
+                self.starts, self.ends = array('q'), array('q')
+                self.starts.fromfile(f, count)
+                self.ends.fromfile(f, count)
+                return True
+        except (OSError, EOFError, struct.error):
+            return False  # Índice ausente, ilegível (ex: um diretório) ou truncado: é recriado
+
+    def _build(self):
+        """
+        Percorre o arquivo uma vez, do início ao fim, registrando as posições das linhas.
+        """
+        self.starts, self.ends = array('q'), array('q')
+        line_start = 0
+        block_size = self.BLOCK_SIZE
+        with open(self.filename, 'rb') as f:
+            while True:
+                # Cada leitura começa no início de uma linha, então as linhas do bloco estão completas
+                f.seek(line_start)
+                block = f.read(block_size)
+                if not block:
+                    break
+
+                newline = block.find(b'\n')
+                if newline == -1:
+                    if len(block) < block_size:  # Última linha, sem quebra de linha
+                        self._add_line(block, 0, len(block), line_start)
+                        break
+                    block_size *= 2  # Linha maior que o bloco
+                    continue
+
+                start = 0
+                while newline != -1:
+                    self._add_line(block, start, newline, line_start)
+                    start = newline + 1
+                    newline = block.find(b'\n', start)
+                line_start += start
+
+    def _add_line(self, block, start, end, offset):
+        """
+        Registra a linha block[start:end], a menos que ela fique vazia após remover '\r',
+        como em last_lines.
+        """
+        if block.count(b'\r', start, end) != end - start:
+            self.starts.append(offset + start)
+            self.ends.append(offset + end)
+
+    def _save(self):
+        try:
+            with open(self.index_filename, 'wb') as f:
+                f.write(self.HEADER.pack(self.MAGIC, self.file_size, self.mtime_ns, len(self.starts)))
+                self.starts.tofile(f)
+                self.ends.tofile(f)
+        except OSError:
+            pass  # Um índice gravado pela metade é descartado por _load na próxima vez
+
+    def __len__(self):
+        return len(self.starts)
+
+    def __getitem__(self, index):
+        """
+        Retorna a linha de número index (a partir de 0; índices negativos contam a partir do fim).
+        """
+        start, end = self.starts[index], self.ends[index]
+        with open(self.filename, 'rb') as f:
+            f.seek(start)
+            return f.read(end - start).decode('utf-8', errors='replace').replace('\r', '') + '\n'
+
+    def line_from_end(self, k):
+        """
+        Retorna a k-ésima linha a partir do fim (k = 0 é a última linha).
+        """
+        return self[-1 - k]
+
+    def __reversed__(self):
+        """
+        Itera sobre as linhas em ordem reversa, como last_lines, usando o índice.
+        """
+        with open(self.filename, 'rb') as f:
+            for i in range(len(self) - 1, -1, -1):
+                f.seek(self.starts[i])
+                yield f.read(self.ends[i] - self.starts[i]).decode('utf-8', errors='replace').replace('\r', '') + '\n'
+
+
+class _FileFollower:
+    """
+    Acompanha as linhas acrescentadas a um arquivo, detectando rotação e truncamento.
+
+    A rotação é detectada pela troca do inode no caminho do arquivo (o arquivo antigo é
+    lido até o fim antes de o novo ser aberto) e o truncamento pela redução do tamanho.
+    """
+
+    def __init__(self, filename):
+        self.filename = filename
+        self.file = open(filename, 'rb')
+        stat = os.fstat(self.file.fileno())
+        self.identity = (stat.st_dev, stat.st_ino)
+        # As linhas iniciais vão apenas até a última quebra de linha: o restante é uma linha
+        # ainda sendo escrita, completada pelas próximas leituras
+        self.size = self._last_newline_end(stat.st_size)
+        self.file.seek(self.size)
+        self.partial = self.file.read(stat.st_size - self.size)  # Linha ainda sem quebra de linha
+
+    def _last_newline_end(self, size):
+        """
+        Posição logo após a última quebra de linha dos primeiros size bytes do arquivo (0 se não houver).
+        """
+        end = size
+        while end > 0:
+            start = max(0, end - io.DEFAULT_BUFFER_SIZE)
+            self.file.seek(start)
+            newline = self.file.read(end - start).rfind(b'\n')
+            if newline >= 0:
+                return start + newline + 1
+            end = start
+        return 0
+
+    def last_lines(self, n):
+        """
+        As últimas n linhas existentes quando o acompanhamento começou, na ordem do arquivo.
+        """
+        lines = list(islice(_mmap_last_lines(self.file, self.size), n))
+        lines.reverse()
+        return lines
+
+    def read_new_lines(self):
+        """
+        Lê, sem bloquear, as linhas completas acrescentadas desde a última leitura.
+        """
+        chunk = self.file.read()
+        if chunk:
+            lines = (self.partial + chunk).split(b'\n')
+            self.partial = lines.pop()
+            return _decode_lines(lines)
+
+        try:
+            stat = os.stat(self.filename)
+        except FileNotFoundError:
+            return []  # Arquivo rotacionado e o novo ainda não foi criado
+
+        if (stat.st_dev, stat.st_ino) != self.identity:
+            # Arquivo rotacionado: o antigo já foi lido até o fim, o novo é lido desde o início
+            lines = _decode_lines([self.partial])
+            self.file.close()
+            self.file = open(self.filename, 'rb')
+            self.identity = (stat.st_dev, stat.st_ino)
+            self.partial = b''
+            return lines + self.read_new_lines()
+
+        if stat.st_size < self.file.tell():
+            # Arquivo truncado: recomeça do início
+            self.file.seek(0)
+            self.partial = b''
+            return self.read_new_lines()
+
+        return []
+
+    def close(self):
+        self.file.close()
+
+
+def _decode_lines(lines):
+    """
+    Decodifica linhas lidas como bytes, no mesmo formato de last_lines (ignorando linhas vazias).
+    """
+    decoded = (line.decode('utf-8', errors='replace').replace('\r', '') for line in lines)
+    return [line + '\n' for line in decoded if line]
+
+
+def follow(filename, n=10, poll_interval=1.0, idle_timeout=None):
+    """
+    Semelhante ao comando `tail -f`: retorna as últimas n linhas do arquivo e depois
+    continua retornando as novas linhas à medida que são acrescentadas.
+
+    Rotação (o arquivo é renomeado e outro é criado no mesmo caminho) e truncamento
+    são detectados, e a leitura continua no novo conteúdo.
+
+    Parâmetros:
+        filename (str): Caminho para o arquivo de texto.
+        n (int): Quantidade de linhas existentes a retornar antes das novas.
+        poll_interval (float): Intervalo, em segundos, entre verificações quando não há novas linhas.
+        idle_timeout (float): Se informado, encerra a iteração após esse tempo sem novas linhas.
+
+    Retorno:
+        iterator: Iterador sobre as linhas, na ordem do arquivo.
+    """
+    follower = _FileFollower(filename)
+    try:
+        yield from follower.last_lines(n)
+        idle_since = time.monotonic()
+        while True:
+            lines = follower.read_new_lines()
+            if lines:
+                yield from lines
+                idle_since = time.monotonic()
+            elif idle_timeout is not None and time.monotonic() - idle_since >= idle_timeout:
+                return
+            else:
+                time.sleep(poll_interval)
+    finally:
+        follower.close()
+
+
+async def async_follow(filename, n=10, poll_interval=1.0, idle_timeout=None):
+    """
+    Versão assíncrona de follow, para uso com `async for`.
+
+    A espera entre verificações é feita com asyncio.sleep, então um único event loop
+    pode acompanhar centenas de arquivos ao mesmo tempo, sem um processo ou thread por arquivo.
+    Os parâmetros e o retorno são os mesmos de follow.
+    """
+    follower = _FileFollower(filename)
+    try:
+        for line in follower.last_lines(n):
+            yield line
+        idle_since = time.monotonic()
+        while True:
+            lines = follower.read_new_lines()
+            if lines:
+                for line in lines:
+                    yield line
+                idle_since = time.monotonic()
+            elif idle_timeout is not None and time.monotonic() - idle_since >= idle_timeout:
+                return
+            else:
+                await asyncio.sleep(poll_interval)
+    finally:
+        follower.close()
@@ -0,0 +1,77 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from .reconcile_accounts import reconcile_accounts, reconcile_key_flags
+from .transaction_keys import TransactionKeyEncoder
+
+
+def _shard_transactions(transactions, keys, shards):
+    """
+    Divide as transações em shards pela chave já codificada, guardando os índices
+    originais de cada transação.
+
+    A divisão só é feita no processo principal, então hash() basta, mesmo não sendo o
+    mesmo entre processos. Cada shard leva apenas as chaves e as datas.
+    """
+    indexes = [[] for _ in range(shards)]
+    for index, key in enumerate(keys):
+        indexes[hash(key) % shards].append(index)
+    shard_keys = [[keys[i] for i in shard] for shard in indexes]
+    shard_dates = [[transactions[i][0] for i in shard] for shard in indexes]
+    return indexes, shard_keys, shard_dates
+
+
+def parallel_reconcile_accounts(transactions1, transactions2, workers=None, shards=None, date_tolerance=None):
+    """
+    Versão paralela de reconcile_accounts.
+
+    A reconciliação de uma transação depende apenas das transações com a mesma chave
+    (departamento, valor, beneficiário), então as duas listas são divididas em shards
+    pela chave e cada shard é reconciliado em um processo de um ProcessPoolExecutor.
+    As flags são então devolvidas às transações originais, na ordem original.
+
+    As chaves são codificadas uma única vez, no processo principal, e cada processo recebe
+    apenas as chaves e as datas do seu shard. Essa etapa serial custa cerca de um terço
+    de reconcile_accounts, o que limita o ganho com muitos processos; com um único núcleo,
+    a versão paralela é mais lenta (ver benchmarks/parallel_reconcile.py).
+
+    O resultado é idêntico ao de reconcile_accounts, inclusive por também acrescentar
+    as flags nas listas recebidas.
+
+    Parâmetros:
+    - transactions1 (list): lista de transações 1
+    - transactions2 (list): lista de transações 2
+    - workers (int): número de processos (padrão: os.cpu_count())
+    - shards (int): número de shards (padrão: 4 por processo, para equilibrar a carga)
+    - date_tolerance (int): janela de datas repassada para reconcile_accounts
+
+    Retorno:
+    - Duas lists: transactions1 e transactions2, com flags de 'FOUND' ou 'MISSING', na ordem original
+    """
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        return reconcile_accounts(transactions1, transactions2, date_tolerance)
+
+    shards = shards or workers * 4
+    # Um único encoder, para que a mesma chave tenha o mesmo código nas duas listas
+    encode_key = TransactionKeyEncoder()
+    indexes1, keys1, dates1 = _shard_transactions(transactions1, encode_key.encode_all(transactions1), shards)
+    indexes2, keys2, dates2 = _shard_transactions(transactions2, encode_key.encode_all(transactions2), shards)
+
+    # Cada processo devolve apenas os bytearrays de flags, que são baratos de serializar
+    flags1 = bytearray(len(transactions1))
+    flags2 = bytearray(len(transactions2))
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        results = executor.map(reconcile_key_flags, keys1, dates1, keys2, dates2, [date_tolerance] * shards)
+        for shard, (shard_flags1, shard_flags2) in enumerate(results):
+            for index, flag in zip(indexes1[shard], shard_flags1):
+                flags1[index] = flag
+            for index, flag in zip(indexes2[shard], shard_flags2):
+                flags2[index] = flag
+
+    for transactions, flags in ((transactions1, flags1), (transactions2, flags2)):
+        for transaction, flag in zip(transactions, flags):
+            transaction.append('FOUND' if flag else 'MISSING')
+
+    return transactions1, transactions2
@@ -0,0 +1,72 @@
+"""
+Linha de comando para reconciliar dois arquivos CSV de transações.
+
+Uso, a partir do diretório `desafio`:
+    python -m functions.reconcile transactions1.csv transactions2.csv -o saida
+
+Os arquivos não devem ter cabeçalho; se tiverem, use --header para ignorar a primeira linha.
+Grava `reconciled1.csv` e `reconciled2.csv` no diretório de saída, com a flag 'FOUND' ou
+'MISSING' acrescentada a cada transação, e informa o tempo e a vazão de cada etapa.
+"""
+import argparse
+import os
+import sys
+import time
+
+from .reconcile_accounts import reconcile_account_flags
+from .transactions_csv import load_transactions, write_transactions
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        prog='python -m functions.reconcile',
+        description='Reconcilia dois arquivos CSV de transações.',
+    )
+    parser.add_argument('transactions1', help='CSV com as transações da lista 1')
+    parser.add_argument('transactions2', help='CSV com as transações da lista 2')
+    parser.add_argument('-o', '--output-dir', default='.', help='diretório onde os resultados serão gravados')
+    parser.add_argument('--date-tolerance', type=int, default=None,
+                        help='diferença máxima, em dias, entre as datas de transações correspondentes')
+    parser.add_argument('--header', action='store_true',
+                        help='ignora a primeira linha de cada arquivo (cabeçalho)')
+    return parser.parse_args(argv)
+
+
+def _report(step, rows, seconds, stream):
+    rate = rows / seconds if seconds > 0 else float('inf')
+    print(f'{step}: {rows} transações em {seconds:.3f}s ({rate:,.0f} transações/s)', file=stream)
+
+
+def main(argv=None, stream=sys.stderr):
+    """
+    Executa a reconciliação com os argumentos da linha de comando.
+    """
+    args = parse_args(argv)
+    os.makedirs(args.output_dir, exist_ok=True)
+
+    start = time.perf_counter()
+    interned = {}  # Compartilhado entre os dois arquivos
+    try:
+        transactions1 = load_transactions(args.transactions1, interned, header=args.header)
+        transactions2 = load_transactions(args.transactions2, interned, header=args.header)
+    except ValueError as error:
+        print(f'erro: {error}', file=stream)
+        return 1
+    rows = len(transactions1) + len(transactions2)
+    loaded = time.perf_counter()
+    _report('leitura', rows, loaded - start, stream)
+
+    flags1, flags2 = reconcile_account_flags(transactions1, transactions2, args.date_tolerance)
+    reconciled = time.perf_counter()
+    _report('reconciliação', rows, reconciled - loaded, stream)
+
+    write_transactions(os.path.join(args.output_dir, 'reconciled1.csv'), transactions1, flags1)
+    write_transactions(os.path.join(args.output_dir, 'reconciled2.csv'), transactions2, flags2)
+    written = time.perf_counter()
+    _report('escrita', rows, written - reconciled, stream)
+    _report('total', rows, written - start, stream)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
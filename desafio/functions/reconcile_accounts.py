@@ -1,4 +1,9 @@
-from collections import defaultdict, deque
+from bisect import bisect_left
+from collections import Counter, defaultdict, deque
+from collections.abc import Sequence
+from datetime import date
+
+from .transaction_keys import TransactionKeyEncoder
 
 def group_transactions_by_key(transactions):
     """
@@ -56,7 +61,223 @@ def restore_original_order(original_list, sorted_with_flags):
     return restored
 
 
-def reconcile_accounts(transactions1, transactions2):
+class DateWindowIndex:
+    """
+    Índice das datas de uma chave, ordenadas, para busca de correspondências dentro de uma janela.
+
+    As datas ficam em uma lista ordenada, pesquisada com bisect, e as posições já utilizadas
+    são puladas por uma estrutura de union-find ("próxima posição livre"), de forma que cada
+    busca custa O(log k) amortizado mesmo quando a chave possui milhares de datas.
+    """
+
+    def __init__(self, entries):
+        """
+        Parâmetros:
+        - entries: lista de tuplas (ordinal da data, índice da transação), já ordenada
+        """
+        self.dates = [ordinal for ordinal, _ in entries]
+        self.indexes = [index for _, index in entries]
+        self.next_free = list(range(len(entries) + 1))  # Posição len(entries) é a sentinela
+
+    def _find(self, position):
+        """
+        Retorna a primeira posição livre a partir de position, comprimindo o caminho percorrido.
+        """
+        root = position
+        while self.next_free[root] != root:
+            root = self.next_free[root]
+        while self.next_free[position] != root:
+            self.next_free[position], position = root, self.next_free[position]
+        return root
+
+    def take(self, ordinal, date_tolerance):
+        """
+        Remove e retorna o índice da transação livre mais antiga com data dentro de
+        [ordinal - date_tolerance, ordinal + date_tolerance], ou None se não houver.
+        """
+        position = self._find(bisect_left(self.dates, ordinal - date_tolerance))
+        if position == len(self.dates) or self.dates[position] > ordinal + date_tolerance:
+            return None
+        self.next_free[position] = position + 1
+        return self.indexes[position]
+
+
+def date_ordinals(transactions):
+    """
+    Converte as datas (formato AAAA-MM-DD) de uma lista de transações em números de
+    dias, convertendo cada data distinta uma única vez.
+    """
+    return _ordinals([transaction[0] for transaction in transactions])
+
+
+def _ordinals(dates):
+    ordinals = {}
+    for day in set(dates):
+        ordinals[day] = date.fromisoformat(day).toordinal()
+    return [ordinals[day] for day in dates]
+
+
+def index_transaction_dates_by_key(transactions, encode_key=None):
+    """
+    Semelhante a group_transactions_by_key, mas associa a cada chave um DateWindowIndex
+    com as datas e os índices das transações.
+
+    Parâmetros:
+    - transactions: lista de transações
+    - encode_key: TransactionKeyEncoder usado para gerar as chaves; deve ser o mesmo
+      usado para consultar o índice
+
+    Retorno:
+    - Um dicionário com as chaves canônicas (ver TransactionKeyEncoder) e valores DateWindowIndex.
+    """
+    if encode_key is None:
+        encode_key = TransactionKeyEncoder()
+    return _index_dates_by_key(encode_key.encode_all(transactions), date_ordinals(transactions))
+
+
+def _index_dates_by_key(keys, ordinals):
+    grouped = defaultdict(list)
+    for index, (key, ordinal) in enumerate(zip(keys, ordinals)):
+        grouped[key].append((ordinal, index))
+    return {key: DateWindowIndex(sorted(entries)) for key, entries in grouped.items()}
+
+
+def match_transactions_within_date_window(transactions1, transactions2, date_tolerance):
+    """
+    Encontra os pares de transações com a mesma chave e datas distantes em no máximo
+    date_tolerance dias.
+
+    As transações da lista 1 são processadas da mais antiga para a mais recente, e cada uma
+    é associada à transação livre mais antiga da lista 2 dentro da janela.
+
+    Retorno:
+    - Dois bytearrays, alinhados com transactions1 e transactions2, com 1 para cada
+      transação encontrada na outra lista e 0 caso contrário
+    """
+    encode_key = TransactionKeyEncoder()
+    keys1 = encode_key.encode_all(transactions1)
+    keys2 = encode_key.encode_all(transactions2)
+    return _match_keys_within_date_window(keys1, date_ordinals(transactions1), keys2, date_ordinals(transactions2),
+                                          date_tolerance)
+
+
+def _match_keys_within_date_window(keys1, ordinals1, keys2, ordinals2, date_tolerance):
+    found1 = bytearray(len(keys1))
+    found2 = bytearray(len(keys2))
+    index2 = _index_dates_by_key(keys2, ordinals2)
+    for i in sorted(range(len(keys1)), key=ordinals1.__getitem__):
+        window_index = index2.get(keys1[i])
+        if window_index is None:
+            continue
+        j = window_index.take(ordinals1[i], date_tolerance)
+        if j is not None:
+            found1[i] = found2[j] = 1
+
+    return found1, found2
+
+
+def match_transactions_by_key(transactions1, transactions2):
+    """
+    Encontra as transações correspondentes entre as duas listas comparando apenas a chave
+    (departamento, valor, beneficiário).
+
+    Em vez de ordenar cópias das listas e depois restaurar a ordem original, ordena apenas
+    as permutações de índices por data e marca o resultado diretamente pela posição.
+    Para cada chave, as transações mais antigas de cada lado são as encontradas.
+    As chaves são geradas por um TransactionKeyEncoder, então valores equivalentes
+    como '16.00' e '16.0' correspondem.
+
+    Retorno:
+    - Dois bytearrays, alinhados com transactions1 e transactions2, com 1 para cada
+      transação encontrada na outra lista e 0 caso contrário
+    """
+    encode_key = TransactionKeyEncoder()
+    keys1 = encode_key.encode_all(transactions1)
+    keys2 = encode_key.encode_all(transactions2)
+    return _match_keys(keys1, [t[0] for t in transactions1], keys2, [t[0] for t in transactions2])
+
+
+def _match_keys(keys1, dates1, keys2, dates2):
+    def flag_transactions(keys, dates, remaining):
+        """
+        Percorre as transações da mais antiga para a mais recente, marcando como encontrada
+        cada uma cuja chave ainda tenha ocorrências disponíveis na outra lista.
+        """
+        found = bytearray(len(keys))
+        for i in sorted(range(len(keys)), key=dates.__getitem__):
+            key = keys[i]
+            if remaining.get(key):
+                remaining[key] -= 1
+                found[i] = 1
+        return found
+
+    return flag_transactions(keys1, dates1, Counter(keys2)), flag_transactions(keys2, dates2, Counter(keys1))
+
+
+def reconcile_key_flags(keys1, dates1, keys2, dates2, date_tolerance=None):
+    """
+    Semelhante a reconcile_account_flags, mas recebe as transações já separadas em chaves
+    (geradas por um mesmo TransactionKeyEncoder) e datas (AAAA-MM-DD).
+
+    Usada por parallel_reconcile_accounts: as chaves são geradas uma única vez no processo
+    principal, e cada processo recebe apenas inteiros e datas, baratos de serializar.
+    """
+    if date_tolerance is not None:
+        return _match_keys_within_date_window(keys1, _ordinals(dates1), keys2, _ordinals(dates2), date_tolerance)
+    return _match_keys(keys1, dates1, keys2, dates2)
+
+
+def reconcile_account_flags(transactions1, transactions2, date_tolerance=None):
+    """
+    Reconcilia as duas listas sem alterá-las, devolvendo apenas as flags.
+
+    Parâmetros:
+    - transactions1 (list): lista de transações 1
+    - transactions2 (list): lista de transações 2
+    - date_tolerance (int): mesma janela de datas de reconcile_accounts
+
+    Retorno:
+    - Dois bytearrays, alinhados com transactions1 e transactions2, com 1 para 'FOUND' e 0 para 'MISSING'
+    """
+    if date_tolerance is not None:
+        return match_transactions_within_date_window(transactions1, transactions2, date_tolerance)
+    return match_transactions_by_key(transactions1, transactions2)
+
+
+class FlaggedTransactions(Sequence):
+    """
+    Visão somente leitura de uma lista de transações com suas flags.
+
+    Nada é copiado: cada transação marcada só é montada quando acessada,
+    no mesmo formato produzido por reconcile_accounts.
+    """
+
+    def __init__(self, transactions, flags):
+        self.transactions = transactions
+        self.flags = flags
+
+    def __len__(self):
+        return len(self.transactions)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        return [*self.transactions[index], 'FOUND' if self.flags[index] else 'MISSING']
+
+
+def reconcile_accounts_view(transactions1, transactions2, date_tolerance=None):
+    """
+    Versão de reconcile_accounts que não altera as listas recebidas.
+
+    Retorno:
+    - Duas FlaggedTransactions, que se comportam como as listas devolvidas por
+      reconcile_accounts, mas sem copiar nenhuma transação
+    """
+    flags1, flags2 = reconcile_account_flags(transactions1, transactions2, date_tolerance)
+    return FlaggedTransactions(transactions1, flags1), FlaggedTransactions(transactions2, flags2)
+
+
+def reconcile_accounts(transactions1, transactions2, date_tolerance=None):
     """
     Compara duas listas de transações e reconcilia elas com base em data, departamento, valor e beneficiário.
     Marca cada transação com 'FOUND' (se encontrada na outra lista) ou 'MISSING' (caso contrário).
@@ -65,40 +286,18 @@ def reconcile_accounts(transactions1, transactions2):
     Parâmetros:
     - transactions1 (list): lista de transações 1
     - transactions2 (list): lista de transações 2
+    - date_tolerance (int): se informado, duas transações só correspondem quando suas datas
+      diferem em no máximo date_tolerance dias (a candidata mais antiga é preferida).
+      Se None, a data não é comparada.
 
     Retorno:
     - Duas lists: transactions1 e transactions2, com flags de 'FOUND' ou 'MISSING', na ordem original
     """
-    # Agrupa as transações por chave (departamento, valor, beneficiário) e associa as datas
-    dict1 = group_transactions_by_key(transactions1)
-    dict2 = group_transactions_by_key(transactions2)
+    found1, found2 = reconcile_account_flags(transactions1, transactions2, date_tolerance)
 
-    # Ordena as transações por data para priorizar reconciliação pelas mais antigas
-    transactions1_sorted = sorted(transactions1, key=lambda x: x[0])
-    transactions2_sorted = sorted(transactions2, key=lambda x: x[0])
+    # As flags são escritas diretamente pelo índice, então a ordem original é mantida
+    for transactions, found in ((transactions1, found1), (transactions2, found2)):
+        for transaction, is_found in zip(transactions, found):
+            transaction.append('FOUND' if is_found else 'MISSING')
 
-    def flag_transactions(transactions, compare_dict):
-        """
-        Marca cada transação como 'FOUND' se a chave existir no dicionário e ainda houver datas disponíveis.
-        Caso contrário, marca como 'MISSING'.
-        """
-        for transaction in transactions:
-            key = tuple(transaction[1:4])
-            if key in compare_dict and compare_dict[key]:
-                transaction.append('FOUND')
-                compare_dict[key].popleft()  # Remove a data correspondente
-                if not compare_dict[key]:  # Remove a chave se não houver mais datas
-                    del compare_dict[key]
-            else:
-                transaction.append('MISSING')
-
-    # Marca as transações da primeira lista com base na segunda
-    flag_transactions(transactions1_sorted, dict2)
-    # Marca as transações da segunda lista com base na primeira
-    flag_transactions(transactions2_sorted, dict1)
-
-    # Restaura a ordem original das listas, agora com as flags
-    transactions1_restored = restore_original_order(transactions1, transactions1_sorted)
-    transactions2_restored = restore_original_order(transactions2, transactions2_sorted)
-
-    return transactions1_restored, transactions2_restored
+    return transactions1, transactions2
@@ -0,0 +1,158 @@
+import pickle
+from bisect import bisect_left, insort
+
+from .reconcile_accounts import FlaggedTransactions, date_ordinals
+from .transaction_keys import TransactionKeyEncoder
+
+
+class ReconciliationSession:
+    """
+    Reconciliação incremental de duas listas de transações que chegam em lotes.
+
+    Assim como em group_transactions_by_key, as transações são indexadas pela chave
+    (departamento, valor, beneficiário), na forma canônica de TransactionKeyEncoder.
+    Para cada chave e cada lado, a sessão guarda listas ordenadas por data das transações
+    encontradas e das pendentes; cada transação nova é comparada apenas com essas
+    listas (busca binária), então o custo de um lote é proporcional ao lote, e não ao
+    total de transações já recebidas.
+
+    Sem date_tolerance, em qualquer momento o resultado é o mesmo de reconcile_accounts
+    aplicado às listas completas, na ordem em que as transações foram adicionadas: uma
+    transação mais antiga que chega depois toma o lugar da encontrada mais recente.
+    Com date_tolerance, cada transação nova é associada à pendente mais antiga do outro
+    lado dentro da janela, e correspondências já feitas não são desfeitas; o resultado é
+    o mesmo de reconcile_accounts quando a lista 2 é adicionada antes e a lista 1 chega
+    em ordem de data, e pode diferir quando transações chegam fora de ordem.
+
+    Parâmetros:
+    -----------
+    date_tolerance : int
+        Mesma janela de datas de reconcile_accounts (None para não comparar datas).
+    """
+
+    def __init__(self, date_tolerance=None):
+        self.date_tolerance = date_tolerance
+        self.transactions = ([], [])       # Transações recebidas de cada lado, na ordem de chegada
+        self.flags = (bytearray(), bytearray())
+        self.unmatched = (set(), set())    # Índices das transações ainda sem correspondência
+        # chave -> ((encontradas do lado 1, do lado 2), (pendentes do lado 1, do lado 2)),
+        # listas de tuplas (data, índice) ordenadas
+        self.key_index = {}
+        self.encode_key = TransactionKeyEncoder()
+
+    def add_left(self, transactions):
+        """
+        Adiciona um lote de transações à lista 1.
+        """
+        self._add(0, transactions)
+
+    def add_right(self, transactions):
+        """
+        Adiciona um lote de transações à lista 2.
+        """
+        self._add(1, transactions)
+
+    def _add(self, side, transactions):
+        transactions = list(transactions)
+        start = len(self.transactions[side])
+        self.transactions[side].extend(transactions)
+        self.flags[side].extend(bytes(len(transactions)))
+        self.unmatched[side].update(range(start, start + len(transactions)))
+
+        keys = self.encode_key.encode_all(transactions)
+        if self.date_tolerance is None:
+            dates, match = [transaction[0] for transaction in transactions], self._match_by_key
+        else:
+            dates, match = date_ordinals(transactions), self._match_within_date_window
+        # Como em reconcile_accounts, as transações do lote são associadas da mais antiga para a mais recente
+        for offset in sorted(range(len(transactions)), key=dates.__getitem__):
+            key_state = self.key_index.get(keys[offset])
+            if key_state is None:
+                key_state = self.key_index[keys[offset]] = (([], []), ([], []))
+            match(side, key_state, (dates[offset], start + offset))
+
+    def _match_by_key(self, side, key_state, entry):
+        """
+        Mantém, para a chave, as transações mais antigas de cada lado como encontradas.
+
+        As encontradas de cada lado são sempre anteriores às pendentes, e apenas um dos
+        lados pode ter pendentes, então basta comparar a transação nova com os extremos das listas.
+        """
+        other = 1 - side
+        matched, pending = key_state
+        if pending[other]:
+            # Todas as transações deste lado já têm correspondência: a nova também terá,
+            # com a pendente mais antiga do outro lado
+            insort(matched[side], entry)
+            partner = pending[other].pop(0)
+            matched[other].append(partner)
+            self._set_flag(side, entry[1], 1)
+            self._set_flag(other, partner[1], 1)
+        elif matched[side] and entry < matched[side][-1]:
+            # Mais antiga que a última encontrada deste lado: toma o lugar dela
+            insort(matched[side], entry)
+            replaced = matched[side].pop()
+            pending[side].insert(0, replaced)
+            self._set_flag(side, entry[1], 1)
+            self._set_flag(side, replaced[1], 0)
+        else:
+            insort(pending[side], entry)
+
+    def _match_within_date_window(self, side, key_state, entry):
+        """
+        Associa a transação nova à pendente mais antiga do outro lado dentro da janela de datas.
+        """
+        _, pending = key_state
+        ordinal, index = entry
+        other_pending = pending[1 - side]
+        position = bisect_left(other_pending, (ordinal - self.date_tolerance,))
+        if position < len(other_pending) and other_pending[position][0] <= ordinal + self.date_tolerance:
+            _, partner = other_pending.pop(position)
+            self._set_flag(side, index, 1)
+            self._set_flag(1 - side, partner, 1)
+        else:
+            insort(pending[side], entry)
+
+    def _set_flag(self, side, index, flag):
+        self.flags[side][index] = flag
+        if flag:
+            self.unmatched[side].discard(index)
+        else:
+            self.unmatched[side].add(index)
+
+    def unmatched_left(self):
+        """
+        Retorna as transações da lista 1 ainda sem correspondência, na ordem de chegada.
+        """
+        return [self.transactions[0][i] for i in sorted(self.unmatched[0])]
+
+    def unmatched_right(self):
+        """
+        Retorna as transações da lista 2 ainda sem correspondência, na ordem de chegada.
+        """
+        return [self.transactions[1][i] for i in sorted(self.unmatched[1])]
+
+    def results(self):
+        """
+        Retorna o estado atual da reconciliação no formato de reconcile_accounts_view.
+        """
+        return (FlaggedTransactions(self.transactions[0], self.flags[0]),
+                FlaggedTransactions(self.transactions[1], self.flags[1]))
+
+    def save(self, path):
+        """
+        Grava o estado da sessão em disco, para que possa ser retomada com load().
+        """
+        with open(path, 'wb') as f:
+            pickle.dump(self, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+    @classmethod
+    def load(cls, path):
+        """
+        Carrega uma sessão gravada com save().
+        """
+        with open(path, 'rb') as f:
+            session = pickle.load(f)
+        if not isinstance(session, cls):
+            raise TypeError(f"O arquivo '{path}' não contém uma {cls.__name__}.")
+        return session
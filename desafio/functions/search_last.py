@@ -0,0 +1,115 @@
+import io
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+
+from .last_lines import MAX_BUFFER_SIZE, _reverse_line_blocks
+
+
+def _matching_substring_lines(block, needle):
+    """
+    Itera em ordem reversa sobre as linhas de um bloco que contêm needle.
+
+    As ocorrências são localizadas diretamente no bloco com rfind, e só as linhas
+    encontradas são recortadas: as demais linhas do bloco nunca são separadas.
+    """
+    end = len(block)
+    while True:
+        found = block.rfind(needle, 0, end)
+        if found < 0:
+            return
+        start = block.rfind(b'\n', 0, found) + 1
+        stop = block.find(b'\n', found + len(needle))
+        yield block[start:end if stop < 0 else stop]
+        if start == 0:
+            return
+        end = start - 1  # Continua a busca antes da quebra de linha que precede a linha encontrada
+
+
+def _matching_regex_lines(block, pattern):
+    """
+    Itera em ordem reversa sobre as linhas de um bloco em que pattern é encontrado.
+
+    O padrão é aplicado à linha sem '\r', como ela é retornada por search_last,
+    para que âncoras como '$' também funcionem em arquivos com quebras de linha CRLF.
+    """
+    if isinstance(pattern.pattern, bytes):
+        decode = lambda data: data.replace(b'\r', b'')  # O padrão é aplicado diretamente aos bytes
+    else:
+        decode = lambda data: data.decode('utf-8', errors='replace').replace('\r', '')
+    lines = block.split(b'\n')
+    lines.reverse()
+    for line in lines:
+        if pattern.search(decode(line)):
+            yield line
+
+
+def _search_file(path, pattern, limit, buffer_size):
+    """
+    Retorna até limit linhas (bytes, da mais recente para a mais antiga) de um arquivo
+    que contêm pattern, interrompendo a leitura assim que o limite é atingido.
+    """
+    matching_lines = _matching_substring_lines if isinstance(pattern, bytes) else _matching_regex_lines
+    matches = []
+    with open(path, 'rb') as f:
+        for block in _reverse_line_blocks(f, buffer_size, MAX_BUFFER_SIZE):
+            for line in matching_lines(block, pattern):
+                if line.strip(b'\r'):  # Assim como em last_lines, linhas vazias são ignoradas
+                    matches.append(line)
+                    if len(matches) == limit:
+                        return matches
+    return matches
+
+
+def search_last(paths, pattern, limit=10, workers=None, buffer_size=io.DEFAULT_BUFFER_SIZE):
+    """
+    Busca as ocorrências mais recentes de um padrão em vários arquivos, lendo cada um de
+    trás para frente, como `tac arquivo | grep padrão | head`.
+
+    Os arquivos são lidos em paralelo em um ThreadPoolExecutor: a leitura libera o GIL,
+    então as threads sobrepõem a espera por disco. A leitura de cada arquivo para assim
+    que limit linhas são encontradas nele.
+
+    Os resultados são retornados dos arquivos modificados mais recentemente para os mais
+    antigos e, dentro de cada arquivo, da última linha para a primeira. Ao atingir limit
+    resultados no total, as leituras ainda não iniciadas são canceladas.
+
+    Parâmetros:
+        paths (iterable): Caminhos dos arquivos.
+        pattern (str | bytes | re.Pattern): Texto procurado nas linhas ou expressão regular
+            (aplicada a cada linha). Textos não podem conter quebras de linha.
+        limit (int): Número máximo de linhas retornadas.
+        workers (int): Número de threads (padrão do ThreadPoolExecutor).
+        buffer_size (int): Tamanho do primeiro bloco lido de cada arquivo em bytes.
+
+    Retorno:
+        iterator: Iterador sobre tuplas (caminho, linha), com a linha decodificada e
+        terminada em '\n', como em last_lines.
+    """
+    if isinstance(pattern, str):
+        pattern = pattern.encode('utf-8')
+    if isinstance(pattern, bytes) and b'\n' in pattern:
+        raise ValueError("O padrão não pode conter quebras de linha.")
+    if not isinstance(pattern, (bytes, re.Pattern)):
+        raise TypeError("O padrão deve ser str, bytes ou uma expressão regular compilada.")
+    # Os argumentos são validados já na chamada, e não apenas ao iniciar a iteração
+    paths = sorted(paths, key=lambda path: os.stat(path).st_mtime_ns, reverse=True)
+    return _search_last(paths, pattern, limit, workers, buffer_size)
+
+
+def _search_last(paths, pattern, limit, workers, buffer_size):
+    if limit <= 0:
+        return
+
+    executor = ThreadPoolExecutor(max_workers=workers)
+    try:
+        futures = [executor.submit(_search_file, path, pattern, limit, buffer_size) for path in paths]
+        remaining = limit
+        for path, future in zip(paths, futures):
+            for line in future.result()[:remaining]:
+                yield path, line.decode('utf-8', errors='replace').replace('\r', '') + '\n'
+                remaining -= 1
+            if remaining == 0:
+                break
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
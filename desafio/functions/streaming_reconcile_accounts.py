@@ -0,0 +1,138 @@
+import csv
+import heapq
+import os
+import tempfile
+import zlib
+from operator import itemgetter
+
+from .reconcile_accounts import reconcile_accounts
+from .transaction_keys import canonical_value
+from .transactions_csv import read_transactions
+
+
+def partition_of(transaction, partitions):
+    """
+    Calcula a partição de uma transação a partir da chave (Departamento, Valor, Beneficiário).
+
+    Usa crc32 em vez de hash() para que o resultado seja o mesmo entre processos
+    (o hash de strings do Python é aleatorizado a cada execução). O valor é usado na forma
+    canônica, para que valores equivalentes ('16.00' e '16.0') caiam na mesma partição.
+
+    Parâmetros:
+    - transaction: transação no formato [data, departamento, valor, beneficiário, ...]
+    - partitions: número total de partições
+
+    Retorno:
+    - Inteiro entre 0 e partitions - 1
+    """
+    department, value, beneficiary = transaction[1:4]
+    key = '\x1f'.join((department, canonical_value(value), beneficiary)).encode('utf-8')
+    return zlib.crc32(key) % partitions
+
+
+def read_transactions_source(source):
+    """
+    Itera sobre as transações de uma fonte, que pode ser um caminho para um arquivo CSV
+    ou qualquer iterável de listas.
+    """
+    if isinstance(source, (str, os.PathLike)):
+        yield from read_transactions(source)
+    else:
+        yield from source
+
+
+def _spill(source, directory, prefix, partitions):
+    """
+    Distribui as transações de uma fonte em arquivos temporários, um por partição.
+    Cada linha gravada é precedida pelo índice original da transação.
+    """
+    paths = [os.path.join(directory, f'{prefix}_{p}.csv') for p in range(partitions)]
+    files = [open(path, 'w', newline='', encoding='utf-8') for path in paths]
+    try:
+        writers = [csv.writer(f) for f in files]
+        for index, transaction in enumerate(read_transactions_source(source)):
+            writers[partition_of(transaction, partitions)].writerow([index, *transaction])
+    finally:
+        for f in files:
+            f.close()
+    return paths
+
+
+def _load_partition(path):
+    """
+    Carrega uma partição do disco, devolvendo as listas de índices e de transações.
+    """
+    indexes, transactions = [], []
+    with open(path, newline='', encoding='utf-8') as f:
+        for row in csv.reader(f):
+            indexes.append(row[0])
+            transactions.append(row[1:])
+    os.remove(path)
+    return indexes, transactions
+
+
+def _write_partition(path, indexes, transactions):
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        for index, transaction in zip(indexes, transactions):
+            writer.writerow([index, *transaction])
+
+
+def _merge_partitions(paths):
+    """
+    Junta as partições já reconciliadas na ordem original das transações.
+    Cada partição está ordenada por índice, então basta um merge de k vias.
+    """
+    files = [open(path, newline='', encoding='utf-8') for path in paths]
+    try:
+        readers = [((int(row[0]), row[1:]) for row in csv.reader(f)) for f in files]
+        for _, transaction in heapq.merge(*readers, key=itemgetter(0)):
+            yield transaction
+    finally:
+        for f in files:
+            f.close()
+
+
+def streaming_reconcile_accounts(source1, source2, partitions=64, tmpdir=None, date_tolerance=None):
+    """
+    Versão de reconcile_accounts para volumes que não cabem em memória.
+
+    As duas fontes são particionadas em disco pela chave (departamento, valor, beneficiário).
+    Como a reconciliação de uma transação depende apenas das transações com a mesma chave,
+    cada partição é reconciliada isoladamente com reconcile_accounts, e o resultado é
+    reordenado por um merge dos arquivos temporários. Apenas uma partição fica em memória
+    por vez, então o pico de memória é aproximadamente (tamanho da entrada / partitions).
+    Uma única chave muito frequente não é dividida entre partições.
+
+    O resultado é idêntico ao de reconcile_accounts para as mesmas entradas.
+
+    Parâmetros:
+    - source1: caminho para um CSV ou iterável de transações da lista 1
+    - source2: caminho para um CSV ou iterável de transações da lista 2
+    - partitions (int): número de partições gravadas em disco
+    - tmpdir (str): diretório onde os arquivos temporários serão criados
+    - date_tolerance (int): janela de datas repassada para reconcile_accounts
+
+    Retorno:
+    - Iterador de tuplas (lado, transação), onde lado é 1 ou 2. Todas as transações da
+      lista 1 são produzidas primeiro, na ordem original e com a flag 'FOUND' ou 'MISSING',
+      seguidas pelas da lista 2. Os arquivos temporários são removidos ao final da iteração.
+    """
+    with tempfile.TemporaryDirectory(dir=tmpdir) as directory:
+        parts1 = _spill(source1, directory, 'in1', partitions)
+        parts2 = _spill(source2, directory, 'in2', partitions)
+
+        out1 = [os.path.join(directory, f'out1_{p}.csv') for p in range(partitions)]
+        out2 = [os.path.join(directory, f'out2_{p}.csv') for p in range(partitions)]
+
+        for p in range(partitions):
+            indexes1, transactions1 = _load_partition(parts1[p])
+            indexes2, transactions2 = _load_partition(parts2[p])
+            reconciled1, reconciled2 = reconcile_accounts(transactions1, transactions2, date_tolerance)
+            _write_partition(out1[p], indexes1, reconciled1)
+            _write_partition(out2[p], indexes2, reconciled2)
+
+        for transaction in _merge_partitions(out1):
+            yield 1, transaction
+        for transaction in _merge_partitions(out2):
+            yield 2, transaction
@@ -0,0 +1,95 @@
+from decimal import Decimal, InvalidOperation
+
+
+def parse_cents(value):
+    """
+    Converte um valor monetário em texto (ex: '16.00', '16.0', '16') para centavos inteiros.
+
+    Retorno:
+    - Inteiro com o valor em centavos, ou None se o texto não for um valor com até duas casas decimais
+    """
+    try:
+        amount = Decimal(value)
+    except (InvalidOperation, TypeError, ValueError):
+        return None
+    if not amount.is_finite():
+        return None
+    cents = amount * 100
+    if cents != cents.to_integral_value():
+        return None
+    return int(cents)
+
+
+def canonical_value(value):
+    """
+    Representação textual canônica de um valor: os centavos, quando o valor é válido,
+    ou o próprio texto, caso contrário. Valores equivalentes têm a mesma representação.
+    """
+    cents = parse_cents(value)
+    return value if cents is None else str(cents)
+
+
+class TransactionKeyEncoder:
+    """
+    Converte a chave (departamento, valor, beneficiário) de uma transação em um único inteiro.
+
+    O valor é convertido para centavos, de forma que '16.00' e '16.0' geram a mesma chave,
+    e departamento e beneficiário recebem ids inteiros na ordem em que aparecem. Os três
+    campos são combinados em um int, mais barato de comparar e de usar como chave de
+    dicionário do que uma tupla de strings. Como os ids dependem da ordem de chegada,
+    as duas listas de uma reconciliação devem usar o mesmo encoder.
+
+    Valores que não são monetários continuam sendo comparados como texto: nesse caso
+    a chave é a tupla original de strings.
+    """
+
+    def __init__(self):
+        self.ids = {}          # departamento/beneficiário -> id
+        self.departments = {}  # departamento -> id já deslocado para sua posição na chave
+        self.cents = {}        # texto do valor -> centavos já deslocados (os mesmos valores se repetem muito)
+
+    def _register_value(self, value):
+        cents = parse_cents(value)
+        self.cents[value] = None if cents is None else cents << 64
+
+    def _register_department(self, department):
+        self.departments[department] = self.ids.setdefault(department, len(self.ids)) << 32
+
+    def _register_beneficiary(self, beneficiary):
+        self.ids.setdefault(beneficiary, len(self.ids))
+
+    def __call__(self, transaction):
+        department, value, beneficiary = transaction[1], transaction[2], transaction[3]
+
+        if value not in self.cents:
+            self._register_value(value)
+        cents = self.cents[value]
+        if cents is None:
+            return (department, value, beneficiary)
+
+        if department not in self.departments:
+            self._register_department(department)
+        if beneficiary not in self.ids:
+            self._register_beneficiary(beneficiary)
+        return cents | self.departments[department] | self.ids[beneficiary]
+
+    def encode_all(self, transactions):
+        """
+        Gera as chaves de uma lista inteira de transações.
+
+        Equivale a [self(t) for t in transactions], mas registra primeiro os valores,
+        departamentos e beneficiários distintos, de forma que o laço sobre as transações
+        faça apenas consultas a dicionários, sem nenhuma chamada de função por linha.
+        """
+        cents, departments, ids = self.cents, self.departments, self.ids
+        for value in {t[2] for t in transactions}.difference(cents):
+            self._register_value(value)
+        for department in {t[1] for t in transactions}.difference(departments):
+            self._register_department(department)
+        for beneficiary in {t[3] for t in transactions}.difference(ids):
+            self._register_beneficiary(beneficiary)
+
+        return [
+            c | departments[t[1]] | ids[t[3]] if (c := cents[t[2]]) is not None else (t[1], t[2], t[3])
+            for t in transactions
+        ]
@@ -0,0 +1,77 @@
+import csv
+
+BUFFER_SIZE = 1 << 20  # Leituras e escritas em blocos de 1 MiB
+
+
+def read_transactions(path, interned=None, buffer_size=BUFFER_SIZE, header=False):
+    """
+    Itera sobre as transações de um arquivo CSV no formato [data, departamento, valor, beneficiário].
+
+    Linhas em branco (comuns no fim de arquivos exportados) são ignoradas; uma linha com
+    menos de quatro campos gera um ValueError com o número da linha.
+
+    Departamentos e beneficiários se repetem muito, então cada valor distinto é mantido em
+    memória uma única vez: as linhas seguintes passam a referenciar a mesma string.
+
+    Parâmetros:
+        path (str): caminho para o arquivo CSV
+        interned (dict): dicionário de strings já vistas; pode ser compartilhado entre
+            arquivos para que os dois lados da reconciliação reaproveitem as mesmas strings
+        buffer_size (int): tamanho do buffer de leitura em bytes
+        header (bool): se True, a primeira linha é um cabeçalho e é ignorada
+
+    Retorno:
+        iterator: iterador sobre as transações (listas de strings)
+    """
+    if interned is None:
+        interned = {}
+    intern = interned.setdefault
+
+    with open(path, newline='', encoding='utf-8', buffering=buffer_size) as f:
+        reader = csv.reader(f)
+        if header:
+            next(reader, None)
+        for row in reader:
+            if len(row) < 4:
+                if not row:
+                    continue
+                raise ValueError(f"{path}, linha {reader.line_num}: esperados 4 campos "
+                                 f"(data, departamento, valor, beneficiário), encontrados {len(row)}.")
+            row[1] = intern(row[1], row[1])
+            row[3] = intern(row[3], row[3])
+            yield row
+
+
+def load_transactions(path, interned=None, buffer_size=BUFFER_SIZE, header=False):
+    """
+    Carrega todas as transações de um arquivo CSV em uma lista. Ver read_transactions.
+    """
+    return list(read_transactions(path, interned, buffer_size, header))
+
+
+def write_transactions(path, transactions, flags=None, buffer_size=BUFFER_SIZE):
+    """
+    Grava transações em um arquivo CSV.
+
+    Parâmetros:
+        path (str): caminho do arquivo de saída
+        transactions (iterable): transações a gravar
+        flags (sequence): se informado, flags no formato de reconcile_account_flags
+            (1 para 'FOUND', 0 para 'MISSING'), acrescentadas a cada linha gravada
+        buffer_size (int): tamanho do buffer de escrita em bytes
+
+    Retorno:
+        int: número de transações gravadas
+    """
+    count = 0
+    with open(path, 'w', newline='', encoding='utf-8', buffering=buffer_size) as f:
+        writer = csv.writer(f)
+        if flags is None:
+            for transaction in transactions:
+                writer.writerow(transaction)
+                count += 1
+        else:
+            for transaction, flag in zip(transactions, flags):
+                writer.writerow([*transaction, 'FOUND' if flag else 'MISSING'])
+                count += 1
+    return count
@@ -0,0 +1,10 @@
+def random_transactions(rng, size):
+    """Gera transações aleatórias com poucas chaves distintas, para que muitas se repitam"""
+    departments = ['Tecnologia', 'Jurídico', 'RH']
+    values = ['16.00', '50.00', '60.00']
+    beneficiaries = ['AWS', 'Bitbucket', 'LinkSquares']
+    return [
+        [f'2020-12-{rng.randint(1, 9):02d}', rng.choice(departments),
+         rng.choice(values), rng.choice(beneficiaries)]
+        for _ in range(size)
+    ]
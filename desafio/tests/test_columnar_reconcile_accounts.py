@@ -0,0 +1,54 @@
+import random
+import unittest
+from functions.reconcile_accounts import reconcile_accounts
+from functions.columnar_reconcile_accounts import columnar_reconcile_accounts, np
+from tests.helpers import random_transactions
+
+
+@unittest.skipIf(np is None, "numpy não está instalado")
+class TestColumnarReconcileAccounts(unittest.TestCase):
+
+    def clone(self, t_list):
+        """Faz cópia para evitar efeitos colaterais nos testes"""
+        return [t[:] for t in t_list]
+
+    def test_same_result_as_reconcile_accounts(self):
+        rng = random.Random(42)
+        t1 = random_transactions(rng, 300)
+        t2 = random_transactions(rng, 250)
+        expected = reconcile_accounts(self.clone(t1), self.clone(t2))
+
+        self.assertEqual(columnar_reconcile_accounts(self.clone(t1), self.clone(t2)), expected)
+
+    def test_values_compared_numerically(self):
+        t1 = [['2020-12-04', 'Tecnologia', '16.0', 'Bitbucket']]
+        t2 = [['2020-12-04', 'Tecnologia', '16.00', 'Bitbucket']]
+
+        reconciled1, reconciled2 = columnar_reconcile_accounts(self.clone(t1), self.clone(t2))
+
+        self.assertEqual(reconciled1[0][-1], 'FOUND')
+        self.assertEqual(reconciled2[0][-1], 'FOUND')
+
+    def test_values_with_fractions_of_cents(self):
+        t1 = [['2020-12-04', 'Tecnologia', '16.005', 'Bitbucket'], ['2020-12-05', 'RH', 'abc', 'AWS']]
+        t2 = [['2020-12-04', 'Tecnologia', '16.00', 'Bitbucket'], ['2020-12-05', 'RH', 'abc', 'AWS']]
+
+        expected = reconcile_accounts(self.clone(t1), self.clone(t2))
+
+        self.assertEqual(columnar_reconcile_accounts(self.clone(t1), self.clone(t2)), expected)
+        self.assertEqual([t[-1] for t in expected[0]], ['MISSING', 'FOUND'])
+
+    def test_one_empty_list(self):
+        t1 = [['2020-12-04', 'RH', '30.00', 'TEST1']]
+
+        reconciled1, reconciled2 = columnar_reconcile_accounts(self.clone(t1), [])
+
+        self.assertEqual(reconciled1[0][-1], 'MISSING')
+        self.assertEqual(reconciled2, [])
+
+    def test_empty_list(self):
+        self.assertEqual(columnar_reconcile_accounts([], []), ([], []))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,147 @@
+import gzip
+import os
+import unittest
+from unittest import mock
+from functions.compressed_last_lines import (SeekableGzipFile, SeekableZstdFile, last_lines_compressed,
+                                             zstandard)
+
+
+class TestCompressedLastLines(unittest.TestCase):
+
+    def setUp(self):
+        self.test_dir = "tests/test_files"
+        os.makedirs(self.test_dir, exist_ok=True)
+        self.lines = [f'Linha {i} ' + 'x' * (i % 97) for i in range(20000)]
+        self.content = ''.join(line + '\n' for line in self.lines).encode('utf-8')
+        self.expected = [line + '\n' for line in reversed(self.lines)]
+
+    def _create_file(self, filename, content):
+        filepath = os.path.join(self.test_dir, filename)
+        with open(filepath, 'wb') as f:
+            f.write(content)
+        return filepath
+
+    def test_plain_file(self):
+        filepath = self._create_file("plain.log", self.content)
+        self.assertEqual(list(last_lines_compressed(filepath)), self.expected)
+
+    def test_gzip_file(self):
+        filepath = self._create_file("single_member.log.gz", gzip.compress(self.content))
+        result = list(last_lines_compressed(filepath, buffer_size=1000, checkpoint_interval=50000))
+        self.assertEqual(result, self.expected)
+
+    def test_gzip_checkpoints(self):
+        filepath = self._create_file("checkpoints.log.gz", gzip.compress(self.content))
+        with SeekableGzipFile(filepath, checkpoint_interval=50000) as f:
+            self.assertGreater(len(f.checkpoints), len(self.content) // 50000 // 2)
+            self.assertEqual(f.size, len(self.content))
+            f.seek(-100, os.SEEK_END)
+            self.assertEqual(f.read(), self.content[-100:])
+            f.seek(123456)
+            self.assertEqual(f.read(70000), self.content[123456:193456])
+
+    def test_gzip_multiple_members(self):
+        half = len(self.content) // 2 + 7  # Membros divididos no meio de uma linha
+        content = gzip.compress(self.content[:half]) + gzip.compress(self.content[half:])
+        filepath = self._create_file("multi_member.log.gz", content)
+        result = list(last_lines_compressed(filepath, buffer_size=1000, checkpoint_interval=1 << 30))
+        self.assertEqual(result, self.expected)
+
+    def test_gzip_empty_file(self):
+        filepath = self._create_file("empty.log.gz", gzip.compress(b''))
+        self.assertEqual(list(last_lines_compressed(filepath)), [])
+
+    def test_partial_consumption(self):
+        filepath = self._create_file("partial.log.gz", gzip.compress(self.content))
+        lines = last_lines_compressed(filepath, checkpoint_interval=50000)
+        self.assertEqual([next(lines) for _ in range(3)], self.expected[:3])
+        lines.close()
+
+    @unittest.skipIf(zstandard is None, "zstandard não está instalado")
+    def test_zstd_multiple_frames(self):
+        compressor = zstandard.ZstdCompressor()
+        frames = [compressor.compress(self.content[i:i + 100000]) for i in range(0, len(self.content), 100000)]
+        skippable = (0x184D2A5E).to_bytes(4, 'little') + (4).to_bytes(4, 'little') + b'\0' * 4
+        filepath = self._create_file("frames.log.zst", b''.join(frames) + skippable)
+
+        with SeekableZstdFile(filepath) as f:
+            self.assertEqual(len(f.checkpoints), len(frames))
+            self.assertEqual(f.size, len(self.content))
+        self.assertEqual(list(last_lines_compressed(filepath, buffer_size=1000)), self.expected)
+
+    @unittest.skipIf(zstandard is None, "zstandard não está instalado")
+    def test_zstd_single_frame(self):
+        filepath = self._create_file("single_frame.log.zst", zstandard.ZstdCompressor().compress(self.content))
+
+        with SeekableZstdFile(filepath, checkpoint_interval=50000) as f:
+            self.assertGreater(len(f.checkpoints), 1)
+            self.assertEqual(f.size, len(self.content))
+            f.seek(123456)
+            self.assertEqual(f.read(70000), self.content[123456:193456])
+            self.assertLessEqual(max(len(segment) for segment in f._cache.values()), 50000)
+        result = list(last_lines_compressed(filepath, buffer_size=1000, checkpoint_interval=50000))
+        self.assertEqual(result, self.expected)
+
+    @unittest.skipIf(zstandard is None, "zstandard não está instalado")
+    def test_zstd_seek_table(self):
+        # Sem o tamanho no cabeçalho dos frames, os tamanhos só podem vir da tabela de busca
+        compressor = zstandard.ZstdCompressor(write_content_size=False)
+        chunks = [self.content[i:i + 300000] for i in range(0, len(self.content), 300000)]
+        frames = [compressor.compress(chunk) for chunk in chunks]
+        entries = b''.join(len(frame).to_bytes(4, 'little') + len(chunk).to_bytes(4, 'little') + b'\0' * 4
+                           for frame, chunk in zip(frames, chunks))
+        footer = len(frames).to_bytes(4, 'little') + b'\x80' + (0x8F92EAB1).to_bytes(4, 'little')
+        seek_table = ((0x184D2A5E).to_bytes(4, 'little') + (len(entries) + len(footer)).to_bytes(4, 'little')
+                      + entries + footer)
+        filepath = self._create_file("seekable.log.zst", b''.join(frames) + seek_table)
+
+        with mock.patch.object(SeekableZstdFile, '_decompress_frame') as decompress_frame:
+            with SeekableZstdFile(filepath, checkpoint_interval=100000) as f:
+                self.assertEqual(f.size, len(self.content))
+                self.assertEqual(len(f.checkpoints), sum(-(-len(chunk) // 100000) for chunk in chunks))
+                f.seek(123456)
+                self.assertEqual(f.read(500000), self.content[123456:623456])
+        decompress_frame.assert_not_called()
+        self.assertEqual(list(last_lines_compressed(filepath, buffer_size=1000)), self.expected)
+
+    @unittest.skipIf(zstandard is None, "zstandard não está instalado")
+    def test_zstd_frame_headers(self):
+        # Frames com vários blocos, blocos RLE e checksum, percorridos sem descomprimir
+        half = len(self.content) // 2
+        content = self.content[:half] + b'x' * 300000 + b'\n' + self.content[half:]
+        frames = [zstandard.ZstdCompressor(write_checksum=True).compress(content[:half]),
+                  zstandard.ZstdCompressor().compress(content[half:half + 300001]),
+                  zstandard.ZstdCompressor(write_checksum=True).compress(content[half + 300001:])]
+        filepath = self._create_file("headers.log.zst", b''.join(frames))
+
+        with mock.patch.object(SeekableZstdFile, '_decompress_frame') as decompress_frame:
+            with SeekableZstdFile(filepath) as f:
+                self.assertEqual([checkpoint[0] for checkpoint in f.checkpoints], [0, half, half + 300001])
+                self.assertEqual(f.size, len(content))
+                f.seek(-100, os.SEEK_END)
+                self.assertEqual(f.read(), content[-100:])
+        decompress_frame.assert_not_called()
+
+    @unittest.skipIf(zstandard is None, "zstandard não está instalado")
+    def test_zstd_frames_without_content_size(self):
+        filepath = os.path.join(self.test_dir, "streamed.log.zst")
+        with open(filepath, 'wb') as f:
+            for i in range(0, len(self.content), 300000):
+                with zstandard.ZstdCompressor().stream_writer(f, closefd=False) as writer:
+                    writer.write(self.content[i:i + 300000])
+
+        with SeekableZstdFile(filepath) as f:
+            self.assertEqual([checkpoint[0] for checkpoint in f.checkpoints],
+                             list(range(0, len(self.content), 300000)))
+            self.assertEqual(f.size, len(self.content))
+        self.assertEqual(list(last_lines_compressed(filepath, buffer_size=1000)), self.expected)
+
+    def tearDown(self):
+        """Deleta os arquivos de teste"""
+        for filename in os.listdir(self.test_dir):
+            os.remove(os.path.join(self.test_dir, filename))
+        os.rmdir(self.test_dir)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,5 +1,11 @@
 import unittest
-from functions.computed_property import computed_property
+import asyncio
+import copy
+import threading
+import time
+import weakref
+from functions.computed_property import (SharedCache, async_computed_property, computed_property, computed_slots,
+                                         stats)
 import pydoc
 from math import sqrt
 
@@ -83,5 +89,446 @@ class TestComputedProperty(unittest.TestCase):
         _ = vector.magnitude
         self.assertEqual(1, vector.calculated)
 
+    def test_recalculate_after_same_value_and_delete(self):
+        vector = self.Vector(1, 3, 5)
+        _ = vector.magnitude
+        vector.x = 1  # Toda atribuição conta como alteração, mesmo com o mesmo valor
+        _ = vector.magnitude
+        vector.teste = 1
+        _ = vector.magnitude
+        del vector.teste
+        _ = vector.magnitude
+        vector.color = 'red'  # Não é dependência
+        _ = vector.magnitude
+        self.assertEqual(4, vector.calculated)
+
+    def test_compare_modes(self):
+        class Basket:
+            def __init__(self):
+                self.items = [1, 2]
+
+            @computed_property('items')
+            def total(self):
+                return sum(self.items)
+
+            @computed_property('items', compare='repr')
+            def checked_total(self):
+                return sum(self.items)
+
+        basket = Basket()
+        self.assertEqual((3, 3), (basket.total, basket.checked_total))
+        basket.items.append(3)  # Alteração sem atribuição: só a comparação por repr percebe
+        self.assertEqual((3, 6), (basket.total, basket.checked_total))
+        basket.items = [10]
+        self.assertEqual((10, 10), (basket.total, basket.checked_total))
+
+        with self.assertRaises(ValueError):
+            computed_property('items', compare='hash')
+
+    def test_property_added_after_class_creation(self):
+        circle = self.Circle(2)
+        self.Circle.area = computed_property('radius')(lambda self: 3 * self.radius ** 2)
+        try:
+            self.assertEqual(12, circle.area)
+            circle.radius = 1
+            self.assertEqual(3, circle.area)
+        finally:
+            del self.Circle.area
+
+    def test_custom_setattr_and_subclass(self):
+        class Base:
+            def __setattr__(self, name, value):
+                super().__setattr__(name, value * 10)
+
+            def __init__(self, radius):
+                self.radius = radius
+
+            @computed_property('radius')
+            def diameter(self):
+                return self.radius * 2
+
+        class Child(Base):
+            pass
+
+        child = Child(1)
+        self.assertEqual(20, child.diameter)
+        child.radius = 2
+        self.assertEqual(40, child.diameter)
+
+    class Box:
+        def __init__(self, width, height, depth):
+            self.width, self.height, self.depth = width, height, depth
+            self.calls = []
+
+        @computed_property('width', 'height')
+        def area(self):
+            self.calls.append('area')
+            return self.width * self.height
+
+        @computed_property('area', 'depth')
+        def volume(self):
+            self.calls.append('volume')
+            return self.area * self.depth
+
+        @computed_property('volume')
+        def description(self):
+            self.calls.append('description')
+            return f'{self.volume} m³'
+
+    def test_transitive_invalidation(self):
+        box = self.Box(2, 3, 4)
+        self.assertEqual('24 m³', box.description)
+        self.assertEqual(['description', 'volume', 'area'], box.calls)
+
+        box.calls.clear()
+        box.width = 1  # Invalida area, volume e description, sem recalcular nada
+        self.assertEqual([], box.calls)
+        self.assertEqual('12 m³', box.description)
+        self.assertEqual(['description', 'volume', 'area'], box.calls)
+
+        box.calls.clear()
+        box.depth = 1  # area continua válida
+        self.assertEqual(3, box.volume)
+        self.assertEqual('3 m³', box.description)
+        self.assertEqual(['volume', 'description'], box.calls)
+
+    def test_dependents_graph(self):
+        self.assertEqual(['area', 'volume', 'description'], [p.name for p in self.Box._computed_dependents['width']])
+        self.assertEqual(['volume', 'description'], [p.name for p in self.Box._computed_dependents['depth']])
+
+    def test_dependency_on_repr_property(self):
+        class Order:
+            def __init__(self):
+                self.items = [1, 2]
+
+            @computed_property('items', compare='repr')
+            def total(self):
+                return sum(self.items)
+
+            @computed_property('total')
+            def summary(self):
+                return f'total: {self.total}'
+
+        order = Order()
+        self.assertEqual('total: 3', order.summary)
+        order.items.append(3)
+        self.assertEqual('total: 6', order.summary)
+
+    def test_dependency_on_plain_property(self):
+        class Order:
+            def __init__(self):
+                self.items = [1, 2]
+
+            @property
+            def count(self):
+                return len(self.items)
+
+            @computed_property('count')
+            def label(self):
+                return f'{self.count} itens'
+
+            @computed_property('label')
+            def summary(self):
+                return f'pedido com {self.label}'
+
+        order = Order()
+        self.assertEqual('pedido com 2 itens', order.summary)
+        order.items.append(3)  # count muda sem nenhuma atribuição
+        self.assertEqual('3 itens', order.label)
+        order.items.append(4)
+        self.assertEqual('pedido com 4 itens', order.summary)
+
+    def test_dependency_on_class_attribute(self):
+        class Scaled:
+            factor = 2
+
+            def __init__(self, x):
+                self.x = x
+
+            @computed_property('x', 'factor')
+            def value(self):
+                return self.x * self.factor
+
+        scaled = Scaled(3)
+        self.assertEqual(6, scaled.value)
+        Scaled.factor = 10  # Alterado na classe, sem atribuição ao objeto
+        self.assertEqual(30, scaled.value)
+        scaled.factor = 5   # Atributo do objeto que esconde o da classe
+        self.assertEqual(15, scaled.value)
+
+    def test_copy_has_independent_cache(self):
+        class Double:
+            def __init__(self, x):
+                self.x = x
+
+            @computed_property('x')
+            def d(self):
+                return self.x * 2
+
+        original = Double(1)
+        self.assertEqual(2, original.d)
+        for duplicate in (copy.copy(original), copy.deepcopy(original)):
+            duplicate.x = 5
+            self.assertEqual(10, duplicate.d)
+            self.assertEqual(1, original.x)
+            self.assertEqual(2, original.d)
+
+    def test_circular_dependency(self):
+        # Erros em __set_name__ são encapsulados em RuntimeError em algumas versões do Python
+        with self.assertRaises((ValueError, RuntimeError)) as context:
+            class Loop:
+                @computed_property('b')
+                def a(self):
+                    return self.b
+
+                @computed_property('a')
+                def b(self):
+                    return self.a
+
+        error = context.exception if isinstance(context.exception, ValueError) else context.exception.__cause__
+        self.assertIsInstance(error, ValueError)
+        self.assertIn('a -> b -> a', str(error))
+
+    class Report:
+        def __init__(self, source):
+            self.source = source
+            self.calls = 0
+
+        @computed_property('source')
+        def total(self):
+            self.calls += 1
+            time.sleep(0.05)  # Cálculo lento: as outras threads chegam enquanto ele está em andamento
+            if self.source is None:
+                raise ValueError("sem dados")
+            return sum(self.source)
+
+        @async_computed_property('source')
+        async def remote_total(self):
+            self.calls += 1
+            await asyncio.sleep(0.01)
+            return sum(self.source)
+
+    def _read_concurrently(self, function, threads=8):
+        barrier = threading.Barrier(threads)
+        results = []
+
+        def worker():
+            barrier.wait()
+            try:
+                results.append(function())
+            except Exception as error:
+                results.append(error)
+
+        workers = [threading.Thread(target=worker) for _ in range(threads)]
+        for worker_thread in workers:
+            worker_thread.start()
+        for worker_thread in workers:
+            worker_thread.join()
+        return results
+
+    def test_single_flight(self):
+        report = self.Report([1, 2, 3])
+        self.assertEqual([6] * 8, self._read_concurrently(lambda: report.total))
+        self.assertEqual(1, report.calls)
+
+        report.source = [1]
+        self.assertEqual([1] * 8, self._read_concurrently(lambda: report.total))
+        self.assertEqual(2, report.calls)
+
+    def test_single_flight_error(self):
+        report = self.Report(None)
+        results = self._read_concurrently(lambda: report.total)
+        self.assertTrue(all(isinstance(result, ValueError) for result in results))
+        self.assertEqual(1, report.calls)
+
+    def test_async_property(self):
+        async def main():
+            report = self.Report([1, 2, 3])
+            results = await asyncio.gather(*(report.remote_total for _ in range(10)))
+            self.assertEqual([6] * 10, results)
+            self.assertEqual(1, report.calls)
+            self.assertEqual(6, await report.remote_total)  # Em cache
+            self.assertEqual(1, report.calls)
+
+            report.source = [4]
+            self.assertEqual(4, await report.remote_total)
+            self.assertEqual(2, report.calls)
+
+            # Cancelar quem aguarda não cancela o cálculo compartilhado
+            report.source = [5]
+            first = asyncio.ensure_future(report.remote_total)
+            second = report.remote_total
+            await asyncio.sleep(0)
+            first.cancel()
+            self.assertEqual(5, await second)
+            self.assertEqual(3, report.calls)
+
+        asyncio.run(main())
+
+    def _shared_point_class(self, cache):
+        calls = []
+
+        class Point:
+            def __init__(self, x, y):
+                self.x, self.y = x, y
+
+            @computed_property('x', 'y', shared_cache=cache)
+            def norm(self):
+                calls.append((self.x, self.y))
+                return sqrt(self.x ** 2 + self.y ** 2)
+
+        return Point, calls
+
+    def test_shared_cache(self):
+        cache = SharedCache(maxsize=2)
+        Point, calls = self._shared_point_class(cache)
+
+        self.assertEqual(5, Point(3, 4).norm)
+        self.assertEqual(5, Point(3, 4).norm)  # Outra instância, mesmas dependências
+        self.assertEqual(5, Point(3.0, 4).norm)  # Valor igual, mas de outro tipo: outra chave
+        self.assertEqual([(3, 4), (3.0, 4)], calls)
+        self.assertEqual((1, 2), (cache.hits, cache.misses))
+
+        point = Point(6, 8)
+        self.assertEqual(10, point.norm)
+        self.assertEqual(2, len(cache))  # (3, 4), a menos usada, foi removida
+        self.assertEqual(5, Point(3, 4).norm)
+        self.assertEqual(4, len(calls))
+
+        # O cache não guarda referências à instância
+        reference = weakref.ref(point)
+        del point
+        self.assertIsNone(reference())
+
+    def test_shared_cache_ttl_and_unhashable(self):
+        cache = SharedCache(ttl=0.01)
+        Point, calls = self._shared_point_class(cache)
+        self.assertEqual(5, Point(3, 4).norm)
+        time.sleep(0.02)
+        self.assertEqual(5, Point(3, 4).norm)
+        self.assertEqual(2, len(calls))
+
+        class Bag:
+            def __init__(self, items):
+                self.items = items
+
+            @computed_property('items', shared_cache=cache)
+            def size(self):
+                return len(self.items)
+
+        self.assertEqual(2, Bag([1, 2]).size)  # Listas não são hashable: o cache compartilhado é ignorado
+        self.assertEqual(1, len(cache))
+
+    def test_shared_cache_returns_the_same_object(self):
+        class Range:
+            def __init__(self, n):
+                self.n = n
+
+            @computed_property('n', shared_cache=SharedCache())
+            def values(self):
+                return list(range(self.n))
+
+        first, second = Range(3), Range(3)
+        self.assertIs(first.values, second.values)
+        first.values.append(3)  # Por isso os resultados de um cache compartilhado devem ser imutáveis
+        self.assertEqual([0, 1, 2, 3], second.values)
+
+    def test_slots(self):
+        class Base:
+            __slots__ = ()
+
+            def describe(self):
+                return 'base'
+
+        @computed_slots
+        class Segment(Base):
+            __slots__ = ('start', 'end', 'calculated')
+
+            def __init__(self, start, end):
+                self.start, self.end = start, end
+                self.calculated = 0
+
+            @computed_property('start', 'end')
+            def length(self):
+                self.calculated += 1
+                return self.end - self.start
+
+            @computed_property('length')
+            def double(self):
+                return self.length * 2
+
+            def describe(self):
+                return 'segment ' + super().describe()  # super() sem argumentos na classe recriada
+
+        segment = Segment(1, 4)
+        self.assertFalse(hasattr(segment, '__dict__'))
+        self.assertEqual((3, 3, 6), (segment.length, segment.length, segment.double))
+        self.assertEqual(1, segment.calculated)
+        segment.end = 10
+        self.assertEqual((9, 18), (segment.length, segment.double))
+        self.assertEqual(2, segment.calculated)
+        self.assertEqual('segment base', segment.describe())
+        self.assertEqual('Segment', Segment.__name__)
+
+        @computed_slots
+        class Counter:
+            __slots__ = ('value',)
+
+            def __init__(self, value):
+                self.value = value
+
+            def __setattr__(self, name, value):
+                # Único método com super(): só é alcançado pela closure do __setattr__ que invalida o cache
+                super().__setattr__(name, value)
+
+            @computed_property('value')
+            def double(self):
+                return self.value * 2
+
+        counter = Counter(2)
+        counter.value = 5
+        self.assertEqual(10, counter.double)
+
+        with self.assertRaises(TypeError):
+            computed_slots(self.Circle)
+
+        class Undecorated:
+            __slots__ = ('start',)
+
+            def __init__(self, start):
+                self.start = start
+
+            @computed_property('start')
+            def double(self):
+                return self.start * 2
+
+        with self.assertRaises(TypeError) as context:
+            Undecorated(1)
+        self.assertIn('computed_slots', str(context.exception))
+
+    def test_stats(self):
+        box = self.Box(2, 3, 4)
+        for name in ('area', 'volume', 'description'):
+            getattr(self.Box, name).reset_stats()
+
+        _ = box.volume
+        _ = box.volume
+        box.width = 5
+        _ = box.volume
+
+        volume = stats(self.Box)['volume']
+        self.assertEqual((1, 2, 2, 1), (volume['hits'], volume['misses'], volume['computations'],
+                                        volume['invalidations']))
+        self.assertGreaterEqual(volume['recompute_time'], 0)
+        self.assertEqual(0, stats(self.Box)['description']['invalidations'])  # Nunca calculada
+        self.assertEqual(volume, self.Box.volume.stats())
+
+        magnitude = self.Vector.magnitude
+        magnitude.reset_stats()
+        vector = self.Vector(1, 2, 2)
+        vector.magnitude = 6  # Só a atribuição a x remove o valor em cache; o restante não conta
+        self.assertEqual(1, magnitude.stats()['invalidations'])
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -1,7 +1,10 @@
 import unittest
+import asyncio
 import os
 import io
-from functions.last_lines import last_lines
+from unittest import mock
+from functions.last_lines import (LineIndex, async_follow, follow, last_line_blocks, last_lines,
+                                  last_lines_bytes, last_lines_mmap, tail)
 
 
 class TestLastLines(unittest.TestCase):
@@ -91,6 +94,224 @@ class TestLastLines(unittest.TestCase):
         with self.assertRaises(FileNotFoundError):
             list(last_lines("non_existent_file.txt"))
 
+    def test_empty_lines_ignored_for_any_buffer_size(self):
+        content = "\nLine 1\n\n\r\nLine 2\n\n"
+        filepath = self._create_file("empty_lines.txt", content)
+        for buffer_size in (1, 2, 3, 8, 1000):
+            self.assertEqual(list(last_lines(filepath, buffer_size)), ["Line 2\n", "Line 1\n"])
+
+    def test_bytes_lines(self):
+        content = "Line 1\r\nLine 2\náé\n".encode('utf-8')
+        filepath = self._create_file("bytes_lines.txt", content, mode='wb')
+        expected = ["áé".encode('utf-8'), b"Line 2", b"Line 1\r"]
+        self.assertEqual(list(last_lines_bytes(filepath)), expected)
+        self.assertEqual(list(last_lines_bytes(filepath, buffer_size=3)), expected)
+
+    def test_line_blocks(self):
+        content = "".join(f"Line {i}\r\n" for i in range(1, 101))
+        filepath = self._create_file("blocks.txt", content)
+
+        blocks = list(last_line_blocks(filepath, buffer_size=64))
+
+        self.assertGreater(len(blocks), 1)
+        self.assertEqual([line for block in blocks for line in block], [f"Line {i}" for i in range(100, 0, -1)])
+
+    def test_adaptive_buffer_size(self):
+        content = "".join(f"Line {i}\n" for i in range(1, 2001))
+        filepath = self._create_file("adaptive.txt", content)
+        expected = [f"Line {i}\n" for i in range(2000, 0, -1)]
+
+        fixed_blocks = list(last_line_blocks(filepath, buffer_size=64, max_buffer_size=None))
+        adaptive_blocks = list(last_line_blocks(filepath, buffer_size=64, max_buffer_size=4096))
+
+        self.assertLess(len(adaptive_blocks), len(fixed_blocks) // 4)
+        self.assertLess(len(adaptive_blocks[0]), len(adaptive_blocks[3]))
+        self.assertEqual(list(last_lines(filepath, buffer_size=64, max_buffer_size=None)), expected)
+        self.assertEqual(list(last_lines(filepath, buffer_size=64, max_buffer_size=4096)), expected)
+
+    def test_pread_and_readahead(self):
+        content = "".join(f"Line {i}\r\n" + "x" * (i % 300) + "\n" for i in range(1, 501))
+        filepath = self._create_file("pread.txt", content)
+        expected = list(last_lines(filepath))
+        for options in ({'pread': True}, {'readahead': True}, {'pread': True, 'readahead': True}):
+            self.assertEqual(list(last_lines(filepath, buffer_size=100, **options)), expected)
+
+    def test_encodings(self):
+        lines = [f"Linha {i} ação ĊĀ 日本 😀" + "é" * (i % 13) for i in range(300)]
+        expected = [line + "\n" for line in reversed(lines)]
+        for encoding in ('utf-8', 'utf-8-sig', 'utf-16', 'utf-16-be', 'utf-32'):
+            filepath = self._create_file(f"encoding_{encoding}.txt", "\r\n".join(lines).encode(encoding), mode='wb')
+            for buffer_size in (7, 64, 1000):
+                with self.subTest(encoding=encoding, buffer_size=buffer_size):
+                    result = list(last_lines(filepath, buffer_size=buffer_size, encoding=encoding))
+                    self.assertEqual(result, expected)
+
+    def test_utf16_byte_order_detection(self):
+        content = "Primeira Ċ\nSegunda\n"
+        for encoding in ('utf-16-le', 'utf-16-be'):
+            bom = '\ufeff'.encode(encoding)
+            filepath = self._create_file(f"bom_{encoding}.txt", bom + content.encode(encoding), mode='wb')
+            self.assertEqual(list(last_lines(filepath, buffer_size=4, encoding='utf-16')),
+                             ["Segunda\n", "Primeira Ċ\n"])
+
+    def test_latin1(self):
+        filepath = self._create_file("latin1.txt", "Ação\nçé\n".encode('latin-1'), mode='wb')
+        self.assertEqual(list(last_lines(filepath, encoding='latin-1')), ["çé\n", "Ação\n"])
+
+    def test_invalid_bytes_replaced(self):
+        filepath = self._create_file("invalid.txt", b"ok\n\xff\xfeinv\xc3lido\n", mode='wb')
+        self.assertEqual(list(last_lines(filepath)), ["\ufffd\ufffdinv\ufffdlido\n", "ok\n"])
+        self.assertEqual(list(last_lines(filepath, errors='ignore')), ["invlido\n", "ok\n"])
+
+    def test_mmap_empty_file(self):
+        filepath = self._create_file("empty.txt", "")
+        self.assertEqual(list(last_lines_mmap(filepath)), [])
+
+    def test_mmap_same_as_last_lines(self):
+        contents = [
+            "Single line file.\n",
+            "First line\nSecond line\nThird line no newline.",
+            "Line 1\r\nLine 2\nLine 3\r\n",
+            "áéíóú\n你好！\n👩🏾‍🦳\n",
+            "\nLine 1\n\nLine 2\n\n",
+        ]
+        for i, content in enumerate(contents):
+            filepath = self._create_file(f"mmap_{i}.txt", content)
+            self.assertEqual(list(last_lines_mmap(filepath)), list(last_lines(filepath)))
+
+    def test_mmap_long_lines(self):
+        long_line = "Long line to test buffer size." * 5000 + "\n"
+        content = "".join(f"Line {i+1}: {long_line}" for i in range(20))
+        filepath = self._create_file("long_lines.txt", content)
+        expected = [f"Line {i+1}: {long_line}" for i in range(19, -1, -1)]
+        self.assertEqual(list(last_lines_mmap(filepath)), expected)
+
+    def test_mmap_file_not_found(self):
+        with self.assertRaises(FileNotFoundError):
+            list(last_lines_mmap("non_existent_file.txt"))
+
+    def test_tail(self):
+        content = "".join(f"Line {i}\n" for i in range(1, 101))
+        filepath = self._create_file("tail.txt", content)
+        self.assertEqual(tail(filepath, 3), ["Line 98\n", "Line 99\n", "Line 100\n"])
+        self.assertEqual(len(tail(filepath, 1000)), 100)
+        self.assertEqual(tail(filepath, 0), [])
+
+    def test_line_index(self):
+        content = "First line\n\nSecond line\r\nThird line no newline."
+        filepath = self._create_file("indexed.txt", content)
+
+        index = LineIndex(filepath)
+
+        self.assertEqual(len(index), 3)
+        self.assertEqual(index[0], "First line\n")
+        self.assertEqual(index.line_from_end(0), "Third line no newline.\n")
+        self.assertEqual(index.line_from_end(1), "Second line\n")
+        self.assertEqual(list(reversed(index)), list(last_lines(filepath)))
+        self.assertTrue(os.path.exists(filepath + ".lineidx"))
+
+    def test_line_index_reused_and_rebuilt(self):
+        filepath = self._create_file("indexed.txt", "Line 1\nLine 2\n")
+        LineIndex(filepath)
+
+        with open(filepath + ".lineidx", "rb") as f:
+            first_index = f.read()
+        with mock.patch.object(LineIndex, '_build', side_effect=AssertionError("o arquivo foi percorrido novamente")):
+            self.assertEqual(len(LineIndex(filepath)), 2)
+
+        with open(filepath, "a", encoding="utf-8") as f:
+            f.write("Line 3\n")
+        index = LineIndex(filepath)
+
+        self.assertEqual(len(index), 3)
+        self.assertEqual(index[-1], "Line 3\n")
+        with open(filepath + ".lineidx", "rb") as f:
+            self.assertNotEqual(f.read(), first_index)
+
+    def test_line_index_not_saved(self):
+        filepath = self._create_file("indexed.txt", "Line 1\nLine 2\n")
+        index_filename = os.path.join(self.test_dir, "missing", "indexed.txt.lineidx")
+
+        index = LineIndex(filepath, index_filename)
+
+        self.assertEqual(index[-1], "Line 2\n")
+        self.assertFalse(os.path.exists(index_filename))
+
+    def test_line_index_unreadable(self):
+        filepath = self._create_file("indexed.txt", "Line 1\nLine 2\n")
+        index_filename = filepath + ".lineidx"
+
+        os.mkdir(index_filename)
+        try:
+            self.assertEqual(LineIndex(filepath)[-1], "Line 2\n")
+        finally:
+            os.rmdir(index_filename)
+
+        LineIndex(filepath)
+        with open(index_filename, "r+b") as f:
+            header = bytearray(f.read(LineIndex.HEADER.size))
+            header[-8:] = (1 << 62).to_bytes(8, 'little')  # Quantidade de linhas corrompida
+            f.seek(0)
+            f.write(header)
+        self.assertEqual(len(LineIndex(filepath)), 2)
+
+    def _append(self, filepath, content):
+        with open(filepath, 'a', encoding='utf-8') as f:
+            f.write(content)
+
+    def test_follow(self):
+        filepath = self._create_file("follow.txt", "Line 1\nLine 2\nLine 3\n")
+        lines = follow(filepath, n=2, poll_interval=0.01, idle_timeout=1)
+
+        self.assertEqual([next(lines), next(lines)], ["Line 2\n", "Line 3\n"])
+        self._append(filepath, "Line 4\nLine ")
+        self.assertEqual(next(lines), "Line 4\n")
+        self._append(filepath, "5\n")
+        self.assertEqual(next(lines), "Line 5\n")
+        lines.close()
+
+    def test_follow_starting_mid_line(self):
+        filepath = self._create_file("follow.txt", "Line 1\nLine ")
+        lines = follow(filepath, n=2, poll_interval=0.01, idle_timeout=1)
+
+        self.assertEqual(next(lines), "Line 1\n")
+        self._append(filepath, "5\n")
+        self.assertEqual(next(lines), "Line 5\n")
+        lines.close()
+
+    def test_follow_rotation_and_truncation(self):
+        filepath = self._create_file("follow.txt", "Line 1\n")
+        lines = follow(filepath, n=1, poll_interval=0.01, idle_timeout=1)
+        self.assertEqual(next(lines), "Line 1\n")
+
+        self._append(filepath, "Line 2\n")
+        os.rename(filepath, filepath + ".1")
+        self._create_file("follow.txt", "New 1\n")
+        self.assertEqual([next(lines), next(lines)], ["Line 2\n", "New 1\n"])
+
+        with open(filepath, 'r+', encoding='utf-8') as f:
+            f.truncate(0)
+        self._append(filepath, "T\n")
+        self.assertEqual(next(lines), "T\n")
+        lines.close()
+
+    def test_follow_idle_timeout(self):
+        filepath = self._create_file("follow.txt", "Line 1\n")
+        self.assertEqual(list(follow(filepath, poll_interval=0.01, idle_timeout=0.05)), ["Line 1\n"])
+
+    def test_async_follow(self):
+        filepath = self._create_file("follow.txt", "Line 1\nLine 2\n")
+
+        async def read_lines():
+            result = []
+            async for line in async_follow(filepath, n=1, poll_interval=0.01, idle_timeout=0.2):
+                result.append(line)
+                if line == "Line 2\n":
+                    self._append(filepath, "Line 3\n")
+            return result
+
+        self.assertEqual(asyncio.run(read_lines()), ["Line 2\n", "Line 3\n"])
+
     def tearDown(self):
         """Deleta os arquivos de teste"""
         for filename in os.listdir(self.test_dir):
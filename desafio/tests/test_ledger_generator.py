@@ -0,0 +1,28 @@
+import unittest
+from collections import Counter
+from benchmarks.ledger_generator import generate_ledgers
+
+
+class TestLedgerGenerator(unittest.TestCase):
+
+    def test_same_seed_same_ledgers(self):
+        self.assertEqual(generate_ledgers(500, seed=3), generate_ledgers(500, seed=3))
+        self.assertNotEqual(generate_ledgers(500, seed=3), generate_ledgers(500, seed=4))
+
+    def test_sizes(self):
+        transactions1, transactions2 = generate_ledgers(300, match_rate=0.5)
+        self.assertEqual(len(transactions1), 300)
+        self.assertEqual(len(transactions2), 300)
+        self.assertTrue(all(len(t) == 4 for t in transactions1 + transactions2))
+
+    def test_key_cardinality_and_skew(self):
+        transactions1, _ = generate_ledgers(2000, key_cardinality=200, skew=0.9, duplicate_rate=0)
+        keys = Counter(tuple(t[1:4]) for t in transactions1)
+
+        self.assertLessEqual(len(keys), 200)
+        hot_rows = sum(count for _, count in keys.most_common(2))
+        self.assertGreater(hot_rows, 1500)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,53 @@
+import random
+import unittest
+from functions.reconcile_accounts import reconcile_accounts
+from functions.parallel_reconcile_accounts import parallel_reconcile_accounts
+from tests.helpers import random_transactions
+
+
+class TestParallelReconcileAccounts(unittest.TestCase):
+
+    def clone(self, t_list):
+        """Faz cópia para evitar efeitos colaterais nos testes"""
+        return [t[:] for t in t_list]
+
+    def test_same_result_as_single_process(self):
+        rng = random.Random(42)
+        t1 = random_transactions(rng, 300)
+        t2 = random_transactions(rng, 250)
+        expected = reconcile_accounts(self.clone(t1), self.clone(t2))
+
+        self.assertEqual(parallel_reconcile_accounts(self.clone(t1), self.clone(t2), workers=2), expected)
+
+    def test_same_result_with_date_tolerance(self):
+        rng = random.Random(7)
+        t1 = random_transactions(rng, 200)
+        t2 = random_transactions(rng, 200)
+        expected = reconcile_accounts(self.clone(t1), self.clone(t2), date_tolerance=1)
+
+        result = parallel_reconcile_accounts(self.clone(t1), self.clone(t2), workers=2, shards=3, date_tolerance=1)
+        self.assertEqual(result, expected)
+
+    def test_equivalent_values_in_the_same_shard(self):
+        t1 = [['2020-12-04', 'Tecnologia', '16.0', 'Bitbucket'], ['2020-12-04', 'RH', 'abc', 'AWS']]
+        t2 = [['2020-12-05', 'Tecnologia', '16.00', 'Bitbucket'], ['2020-12-04', 'RH', 'abc', 'AWS']]
+
+        reconciled1, reconciled2 = parallel_reconcile_accounts(self.clone(t1), self.clone(t2), workers=2, shards=7)
+
+        self.assertEqual([t[-1] for t in reconciled1 + reconciled2], ['FOUND'] * 4)
+
+    def test_single_worker(self):
+        t1 = [['2020-12-04', 'Tecnologia', '16.00', 'Bitbucket']]
+        t2 = [['2020-12-05', 'Tecnologia', '16.00', 'Bitbucket']]
+
+        reconciled1, reconciled2 = parallel_reconcile_accounts(self.clone(t1), self.clone(t2), workers=1)
+
+        self.assertEqual(reconciled1[0][-1], 'FOUND')
+        self.assertEqual(reconciled2[0][-1], 'FOUND')
+
+    def test_empty_list(self):
+        self.assertEqual(parallel_reconcile_accounts([], [], workers=2), ([], []))
+
+
+if __name__ == '__main__':
+    unittest.main()
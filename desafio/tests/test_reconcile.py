@@ -0,0 +1,61 @@
+import io
+import os
+import tempfile
+import unittest
+from functions.reconcile import main
+from functions.transactions_csv import load_transactions, write_transactions
+
+
+class TestReconcileCommandLine(unittest.TestCase):
+
+    def test_reconcile_files(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path1 = os.path.join(directory, 'transactions1.csv')
+            path2 = os.path.join(directory, 'transactions2.csv')
+            output_dir = os.path.join(directory, 'saida')
+            write_transactions(path1, [
+                ['2020-12-04', 'Tecnologia', '16.00', 'Bitbucket'],
+                ['2020-12-05', 'Tecnologia', '50.00', 'AWS'],
+            ])
+            write_transactions(path2, [
+                ['2020-12-06', 'Tecnologia', '50.00', 'AWS'],
+            ])
+
+            report = io.StringIO()
+            self.assertEqual(main([path1, path2, '-o', output_dir, '--date-tolerance', '1'], stream=report), 0)
+
+            self.assertEqual(load_transactions(os.path.join(output_dir, 'reconciled1.csv')), [
+                ['2020-12-04', 'Tecnologia', '16.00', 'Bitbucket', 'MISSING'],
+                ['2020-12-05', 'Tecnologia', '50.00', 'AWS', 'FOUND'],
+            ])
+            self.assertEqual(load_transactions(os.path.join(output_dir, 'reconciled2.csv')), [
+                ['2020-12-06', 'Tecnologia', '50.00', 'AWS', 'FOUND'],
+            ])
+            self.assertIn('transações/s', report.getvalue())
+
+
+    def test_header_and_invalid_rows(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path1 = os.path.join(directory, 'transactions1.csv')
+            path2 = os.path.join(directory, 'transactions2.csv')
+            with open(path1, 'w', encoding='utf-8') as f:
+                f.write('date,department,value,beneficiary\n2020-12-04,Tecnologia,16.00,AWS\n\n')
+            with open(path2, 'w', encoding='utf-8') as f:
+                f.write('date,department,value,beneficiary\n2020-12-05,Tecnologia,16.00,AWS\n')
+
+            report = io.StringIO()
+            arguments = [path1, path2, '-o', directory, '--date-tolerance', '1']
+            self.assertEqual(main(arguments + ['--header'], stream=report), 0)
+            self.assertEqual(load_transactions(os.path.join(directory, 'reconciled1.csv')), [
+                ['2020-12-04', 'Tecnologia', '16.00', 'AWS', 'FOUND'],
+            ])
+
+            with open(path2, 'a', encoding='utf-8') as f:
+                f.write('2020-12-06\n')
+            report = io.StringIO()
+            self.assertEqual(main(arguments + ['--header'], stream=report), 1)
+            self.assertIn('linha 3', report.getvalue())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,5 +1,5 @@
 import unittest
-from functions.reconcile_accounts import reconcile_accounts
+from functions.reconcile_accounts import reconcile_account_flags, reconcile_accounts, reconcile_accounts_view
 
 
 class TestReconcileAccounts(unittest.TestCase):
@@ -130,6 +130,105 @@ class TestReconcileAccounts(unittest.TestCase):
         self.assertEqual([], reconciled1)
         self.assertEqual([], reconciled2)
 
+    def test_date_tolerance(self):
+        t1 = [
+            ['2020-12-04', 'Tecnologia', '16.00', 'Bitbucket'],
+            ['2020-12-05', 'Tecnologia', '50.00', 'AWS'],
+            ['2020-12-10', 'Jurídico', '60.00', 'LinkSquares'],
+        ]
+        t2 = [
+            ['2020-12-05', 'Tecnologia', '16.00', 'Bitbucket'],
+            ['2020-12-04', 'Tecnologia', '50.00', 'AWS'],
+            ['2020-12-04', 'Jurídico', '60.00', 'LinkSquares'],
+        ]
+
+        reconciled1, reconciled2 = reconcile_accounts(self.clone(t1), self.clone(t2), date_tolerance=1)
+
+        self.assertEqual([t[-1] for t in reconciled1], ['FOUND', 'FOUND', 'MISSING'])
+        self.assertEqual([t[-1] for t in reconciled2], ['FOUND', 'FOUND', 'MISSING'])
+
+    def test_date_tolerance_prefers_earliest_candidate(self):
+        t1 = [
+            ['2020-12-05', 'Tecnologia', '50.00', 'AWS'],
+        ]
+        t2 = [
+            ['2020-12-06', 'Tecnologia', '50.00', 'AWS'],
+            ['2020-12-04', 'Tecnologia', '50.00', 'AWS'],
+            ['2020-12-05', 'Tecnologia', '50.00', 'AWS'],
+        ]
+
+        reconciled1, reconciled2 = reconcile_accounts(self.clone(t1), self.clone(t2), date_tolerance=1)
+
+        self.assertEqual(reconciled1[0][-1], 'FOUND')
+        self.assertEqual([t[-1] for t in reconciled2], ['MISSING', 'FOUND', 'MISSING'])
+
+    def test_date_tolerance_exact_date(self):
+        t1 = [
+            ['2020-12-05', 'Tecnologia', '50.00', 'AWS'],
+            ['2020-12-05', 'Tecnologia', '50.00', 'AWS'],
+        ]
+        t2 = [
+            ['2020-12-06', 'Tecnologia', '50.00', 'AWS'],
+            ['2020-12-05', 'Tecnologia', '50.00', 'AWS'],
+        ]
+
+        reconciled1, reconciled2 = reconcile_accounts(self.clone(t1), self.clone(t2), date_tolerance=0)
+
+        self.assertEqual([t[-1] for t in reconciled1], ['FOUND', 'MISSING'])
+        self.assertEqual([t[-1] for t in reconciled2], ['MISSING', 'FOUND'])
+
+    def test_equivalent_values(self):
+        t1 = [
+            ['2020-12-04', 'Tecnologia', '16.0', 'Bitbucket'],
+            ['2020-12-05', 'Tecnologia', '50', 'AWS'],
+        ]
+        t2 = [
+            ['2020-12-04', 'Tecnologia', '16.00', 'Bitbucket'],
+            ['2020-12-05', 'Tecnologia', '50.00', 'AWS'],
+        ]
+
+        for date_tolerance in (None, 1):
+            reconciled1, reconciled2 = reconcile_accounts(self.clone(t1), self.clone(t2), date_tolerance)
+            self.assertEqual([t[-1] for t in reconciled1], ['FOUND', 'FOUND'])
+            self.assertEqual([t[-1] for t in reconciled2], ['FOUND', 'FOUND'])
+
+    def test_flags_do_not_mutate_input(self):
+        t1 = [
+            ['2020-12-04', 'Tecnologia', '16.00', 'Bitbucket'],
+            ['2020-12-05', 'Tecnologia', '50.00', 'AWS'],
+        ]
+        t2 = [
+            ['2020-12-05', 'Tecnologia', '50.00', 'AWS'],
+        ]
+        original1, original2 = self.clone(t1), self.clone(t2)
+
+        flags1, flags2 = reconcile_account_flags(t1, t2)
+
+        self.assertEqual(flags1, bytearray([0, 1]))
+        self.assertEqual(flags2, bytearray([1]))
+        self.assertEqual(t1, original1)
+        self.assertEqual(t2, original2)
+
+    def test_view_matches_reconcile_accounts(self):
+        t1 = [
+            ['2020-12-05', 'Tecnologia', '16.00', 'Bitbucket'],
+            ['2020-12-04', 'Tecnologia', '16.00', 'Bitbucket'],
+            ['2020-12-04', 'Jurídico', '60.00', 'LinkSquares'],
+        ]
+        t2 = [
+            ['2020-12-04', 'Tecnologia', '16.00', 'Bitbucket'],
+            ['2020-12-06', 'Jurídico', '60.00', 'LinkSquares'],
+        ]
+        expected1, expected2 = reconcile_accounts(self.clone(t1), self.clone(t2), date_tolerance=1)
+
+        view1, view2 = reconcile_accounts_view(t1, t2, date_tolerance=1)
+
+        self.assertEqual(list(view1), expected1)
+        self.assertEqual(list(view2), expected2)
+        self.assertEqual(view1[-1], expected1[-1])
+        self.assertEqual(view1[1:], expected1[1:])
+        self.assertEqual(len(t1[0]), 4)
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,84 @@
+import os
+import random
+import tempfile
+import unittest
+from functions.reconcile_accounts import reconcile_accounts
+from functions.reconciliation_session import ReconciliationSession
+from tests.helpers import random_transactions
+
+
+class TestReconciliationSession(unittest.TestCase):
+
+    def clone(self, t_list):
+        """Faz cópia para evitar efeitos colaterais nos testes"""
+        return [t[:] for t in t_list]
+
+    def test_batches_match_full_reconciliation(self):
+        rng = random.Random(42)
+        t1 = random_transactions(rng, 200)
+        t2 = random_transactions(rng, 180)
+
+        session = ReconciliationSession()
+        for start in range(0, 200, 30):
+            session.add_left(t1[start:start + 30])
+            session.add_right(t2[start:start + 30])
+
+        expected1, expected2 = reconcile_accounts(self.clone(t1), self.clone(t2))
+        result1, result2 = session.results()
+        self.assertEqual(list(result1), expected1)
+        self.assertEqual(list(result2), expected2)
+
+    def test_date_window_batches_in_date_order(self):
+        rng = random.Random(7)
+        t1 = sorted(random_transactions(rng, 200), key=lambda t: t[0])
+        t2 = random_transactions(rng, 180)
+
+        session = ReconciliationSession(date_tolerance=1)
+        session.add_right(t2)
+        for start in range(0, 200, 30):
+            session.add_left(t1[start:start + 30])
+
+        expected1, expected2 = reconcile_accounts(self.clone(t1), self.clone(t2), date_tolerance=1)
+        result1, result2 = session.results()
+        self.assertEqual(list(result1), expected1)
+        self.assertEqual(list(result2), expected2)
+
+    def test_unmatched(self):
+        session = ReconciliationSession()
+        session.add_left([
+            ['2020-12-04', 'Tecnologia', '16.00', 'Bitbucket'],
+            ['2020-12-05', 'Tecnologia', '50.00', 'AWS'],
+        ])
+        self.assertEqual(len(session.unmatched_left()), 2)
+
+        session.add_right([['2020-12-05', 'Tecnologia', '50.00', 'AWS']])
+
+        self.assertEqual(session.unmatched_left(), [['2020-12-04', 'Tecnologia', '16.00', 'Bitbucket']])
+        self.assertEqual(session.unmatched_right(), [])
+
+    def test_earlier_transaction_takes_the_match(self):
+        session = ReconciliationSession()
+        session.add_right([['2020-12-05', 'Tecnologia', '50.00', 'AWS']])
+        session.add_left([['2020-12-06', 'Tecnologia', '50.00', 'AWS']])
+        session.add_left([['2020-12-04', 'Tecnologia', '50.00', 'AWS']])
+
+        result1, _ = session.results()
+
+        self.assertEqual([t[-1] for t in result1], ['MISSING', 'FOUND'])
+
+    def test_save_and_load(self):
+        session = ReconciliationSession()
+        session.add_left([['2020-12-04', 'Tecnologia', '16.00', 'Bitbucket']])
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'session.pickle')
+            session.save(path)
+            restored = ReconciliationSession.load(path)
+
+        restored.add_right([['2020-12-04', 'Tecnologia', '16.00', 'Bitbucket']])
+        self.assertEqual(restored.unmatched_left(), [])
+        self.assertEqual(restored.unmatched_right(), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
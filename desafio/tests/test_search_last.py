@@ -0,0 +1,70 @@
+import os
+import re
+import unittest
+from functions.search_last import search_last
+
+
+class TestSearchLast(unittest.TestCase):
+
+    def setUp(self):
+        self.test_dir = "tests/test_files"
+        os.makedirs(self.test_dir, exist_ok=True)
+
+    def _create_file(self, filename, content, mtime):
+        filepath = os.path.join(self.test_dir, filename)
+        with open(filepath, 'wb') as f:
+            f.write(content.encode('utf-8'))
+        os.utime(filepath, (mtime, mtime))
+        return filepath
+
+    def _create_logs(self):
+        old = self._create_file("search_old.log", "ERROR 1\nINFO 2\nERROR 3\n", mtime=1000)
+        new = self._create_file("search_new.log", "ERROR a\r\nINFO b\r\nERROR c\r\nINFO d\r\n", mtime=2000)
+        return old, new
+
+    def test_newest_first(self):
+        old, new = self._create_logs()
+        result = list(search_last([old, new], 'ERROR', limit=10))
+        expected = [(new, "ERROR c\n"), (new, "ERROR a\n"), (old, "ERROR 3\n"), (old, "ERROR 1\n")]
+        self.assertEqual(result, expected)
+
+    def test_limit(self):
+        old, new = self._create_logs()
+        self.assertEqual(list(search_last([old, new], 'ERROR', limit=3)),
+                         [(new, "ERROR c\n"), (new, "ERROR a\n"), (old, "ERROR 3\n")])
+        self.assertEqual(list(search_last([old, new], 'ERROR', limit=0)), [])
+
+    def test_regex(self):
+        old, new = self._create_logs()
+        result = list(search_last([old, new], re.compile(r'^INFO \d$'), limit=10))
+        self.assertEqual(result, [(old, "INFO 2\n")])
+        result = list(search_last([old, new], re.compile(rb'[bd]$'), limit=10))
+        self.assertEqual(result, [(new, "INFO d\n"), (new, "INFO b\n")])
+
+    def test_regex_crlf(self):
+        old, new = self._create_logs()
+        result = list(search_last([old, new], re.compile(r'^ERROR \w$'), limit=10))
+        expected = [(new, "ERROR c\n"), (new, "ERROR a\n"), (old, "ERROR 3\n"), (old, "ERROR 1\n")]
+        self.assertEqual(result, expected)
+
+    def test_matches_across_blocks(self):
+        lines = [f'linha {i} ' + ('alvo' if i % 7 == 0 else 'x' * (i % 50)) for i in range(2000)]
+        filepath = self._create_file("search_blocks.log", '\n'.join(lines), mtime=1000)
+        expected = [(filepath, line + '\n') for line in reversed(lines) if 'alvo' in line]
+        self.assertEqual(list(search_last([filepath], 'alvo', limit=1000, buffer_size=64)), expected)
+        self.assertEqual(list(search_last([filepath], 'alvo', limit=5, buffer_size=64)), expected[:5])
+
+    def test_pattern_with_newline(self):
+        old, new = self._create_logs()
+        with self.assertRaises(ValueError):
+            search_last([old, new], 'ERROR\nINFO')
+
+    def tearDown(self):
+        """Deleta os arquivos de teste"""
+        for filename in os.listdir(self.test_dir):
+            os.remove(os.path.join(self.test_dir, filename))
+        os.rmdir(self.test_dir)
+
+
+if __name__ == '__main__':
+    unittest.main()
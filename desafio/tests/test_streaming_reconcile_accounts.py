@@ -0,0 +1,77 @@
+import csv
+import os
+import random
+import tempfile
+import unittest
+from functions.reconcile_accounts import reconcile_accounts
+from functions.streaming_reconcile_accounts import streaming_reconcile_accounts
+from tests.helpers import random_transactions
+
+
+class TestStreamingReconcileAccounts(unittest.TestCase):
+
+    def clone(self, t_list):
+        """Faz cópia para evitar efeitos colaterais nos testes"""
+        return [t[:] for t in t_list]
+
+    def split_sides(self, results):
+        results = list(results)
+        side1 = [t for side, t in results if side == 1]
+        side2 = [t for side, t in results if side == 2]
+        return side1, side2
+
+    def test_same_result_as_in_memory(self):
+        rng = random.Random(42)
+        t1 = random_transactions(rng, 300)
+        t2 = random_transactions(rng, 250)
+        expected = reconcile_accounts(self.clone(t1), self.clone(t2))
+
+        for partitions in (1, 7, 64):
+            results = streaming_reconcile_accounts(self.clone(t1), self.clone(t2), partitions=partitions)
+            self.assertEqual(self.split_sides(results), expected)
+
+    def test_same_result_as_in_memory_with_date_tolerance(self):
+        rng = random.Random(7)
+        t1 = random_transactions(rng, 200)
+        t2 = random_transactions(rng, 200)
+        expected = reconcile_accounts(self.clone(t1), self.clone(t2), date_tolerance=1)
+
+        results = streaming_reconcile_accounts(self.clone(t1), self.clone(t2), partitions=5, date_tolerance=1)
+        self.assertEqual(self.split_sides(results), expected)
+
+    def test_csv_paths(self):
+        t1 = [
+            ['2020-12-04', 'Tecnologia', '16.00', 'Bitbucket'],
+            ['2020-12-04', 'Jurídico', '60.00', 'LinkSquares'],
+            ['2020-12-05', 'Tecnologia', '50.00', 'AWS'],
+        ]
+        t2 = [
+            ['2020-12-04', 'Jurídico', '60.00', 'LinkSquares'],
+            ['2020-12-05', 'Tecnologia', '50.00', 'AWS'],
+        ]
+        with tempfile.TemporaryDirectory() as directory:
+            paths = []
+            for name, rows in (('t1.csv', t1), ('t2.csv', t2)):
+                path = os.path.join(directory, name)
+                with open(path, 'w', newline='', encoding='utf-8') as f:
+                    csv.writer(f).writerows(rows)
+                paths.append(path)
+
+            reconciled1, reconciled2 = self.split_sides(streaming_reconcile_accounts(*paths, partitions=4))
+
+        self.assertEqual(reconciled1, [
+            ['2020-12-04', 'Tecnologia', '16.00', 'Bitbucket', 'MISSING'],
+            ['2020-12-04', 'Jurídico', '60.00', 'LinkSquares', 'FOUND'],
+            ['2020-12-05', 'Tecnologia', '50.00', 'AWS', 'FOUND'],
+        ])
+        self.assertEqual(reconciled2, [
+            ['2020-12-04', 'Jurídico', '60.00', 'LinkSquares', 'FOUND'],
+            ['2020-12-05', 'Tecnologia', '50.00', 'AWS', 'FOUND'],
+        ])
+
+    def test_empty_sources(self):
+        self.assertEqual(list(streaming_reconcile_accounts([], [])), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,39 @@
+import unittest
+from functions.transaction_keys import TransactionKeyEncoder, canonical_value, parse_cents
+
+
+class TestTransactionKeys(unittest.TestCase):
+
+    def test_parse_cents(self):
+        self.assertEqual(parse_cents('16.00'), 1600)
+        self.assertEqual(parse_cents('16.0'), 1600)
+        self.assertEqual(parse_cents('16'), 1600)
+        self.assertEqual(parse_cents('-0.5'), -50)
+        self.assertIsNone(parse_cents('16.005'))
+        self.assertIsNone(parse_cents('dezesseis'))
+        self.assertIsNone(parse_cents('NaN'))
+
+    def test_canonical_value(self):
+        self.assertEqual(canonical_value('16.0'), canonical_value('16.00'))
+        self.assertEqual(canonical_value('abc'), 'abc')
+
+    def test_equivalent_values_same_key(self):
+        encode_key = TransactionKeyEncoder()
+        key = encode_key(['2020-12-04', 'Tecnologia', '16.00', 'Bitbucket'])
+
+        self.assertIsInstance(key, int)
+        self.assertEqual(key, encode_key(['2020-12-05', 'Tecnologia', '16.0', 'Bitbucket']))
+        self.assertNotEqual(key, encode_key(['2020-12-04', 'Tecnologia', '16.01', 'Bitbucket']))
+        self.assertNotEqual(key, encode_key(['2020-12-04', 'Bitbucket', '16.00', 'Tecnologia']))
+        self.assertNotEqual(key, encode_key(['2020-12-04', 'Tecnologia', '-16.00', 'Bitbucket']))
+
+    def test_non_monetary_value_compared_as_text(self):
+        encode_key = TransactionKeyEncoder()
+        key = encode_key(['2020-12-04', 'RH', 'n/a', 'TEST1'])
+
+        self.assertEqual(key, ('RH', 'n/a', 'TEST1'))
+        self.assertEqual(key, encode_key(['2020-12-05', 'RH', 'n/a', 'TEST1']))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,66 @@
+import os
+import tempfile
+import unittest
+from functions.transactions_csv import load_transactions, write_transactions
+
+
+class TestTransactionsCsv(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'transactions.csv')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_round_trip(self):
+        transactions = [
+            ['2020-12-04', 'Tecnologia', '16.00', 'Bitbucket'],
+            ['2020-12-04', 'Jurídico', '60.00', 'Link, Squares'],
+        ]
+        self.assertEqual(write_transactions(self.path, transactions), 2)
+        self.assertEqual(load_transactions(self.path), transactions)
+
+    def test_write_flags(self):
+        transactions = [
+            ['2020-12-04', 'Tecnologia', '16.00', 'Bitbucket'],
+            ['2020-12-05', 'Tecnologia', '50.00', 'AWS'],
+        ]
+        write_transactions(self.path, transactions, bytearray([1, 0]))
+
+        self.assertEqual(load_transactions(self.path), [
+            ['2020-12-04', 'Tecnologia', '16.00', 'Bitbucket', 'FOUND'],
+            ['2020-12-05', 'Tecnologia', '50.00', 'AWS', 'MISSING'],
+        ])
+        self.assertEqual(len(transactions[0]), 4)
+
+    def test_repeated_strings_are_shared(self):
+        write_transactions(self.path, [
+            ['2020-12-04', 'Tecnologia', '16.00', 'AWS'],
+            ['2020-12-05', 'Tecnologia', '50.00', 'AWS'],
+        ])
+        interned = {}
+        first, second = load_transactions(self.path, interned)
+
+        self.assertIs(first[1], second[1])
+        self.assertIs(first[3], second[3])
+        self.assertEqual(set(interned), {'Tecnologia', 'AWS'})
+
+
+    def test_blank_lines_and_header(self):
+        with open(self.path, 'w', encoding='utf-8', newline='') as f:
+            f.write('date,department,value,beneficiary\r\n2020-12-04,Tecnologia,16.00,AWS\r\n\r\n')
+
+        self.assertEqual(load_transactions(self.path, header=True), [['2020-12-04', 'Tecnologia', '16.00', 'AWS']])
+
+    def test_short_row(self):
+        with open(self.path, 'w', encoding='utf-8', newline='') as f:
+            f.write('2020-12-04,Tecnologia,16.00,AWS\n2020-12-05,Tecnologia\n')
+
+        with self.assertRaises(ValueError) as context:
+            load_transactions(self.path)
+        self.assertIn('linha 2', str(context.exception))
+
+
+if __name__ == '__main__':
+    unittest.main()